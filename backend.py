@@ -0,0 +1,141 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import cache
+from typing import Any, Callable, NamedTuple
+
+from config import BACKEND, BROKER_SOCKET, SEARCH_MIN_SEEDERS, YGG_BASE_URL
+from matching import matches_query
+from metrics import stage_seconds
+
+_use_broker = bool(BROKER_SOCKET)
+IDLE_POLL_SECONDS = 2
+
+# Set on 503 responses caused by a BackendError, so a front end can tell them from per-request failures
+UNAVAILABLE_HEADER = "X-YGG-Unavailable"
+
+
+class BackendError(Exception):
+    """The YGG session could not do the work (login failed, Cloudflare, session lost): retrying later may succeed,
+    unlike an empty result."""
+
+
+class Backend(ABC):
+    """What the API needs from a YGG session: search, download and login state."""
+
+    passkey: str | None = None
+    logged_in: bool = False
+    _lock = None  # threading.Lock held for the whole of a search or download
+
+    @property
+    def busy(self) -> bool:
+        return self._lock is not None and self._lock.locked()
+
+    @contextmanager
+    def _locked(self):
+        start = time.perf_counter()
+        with self._lock:
+            stage_seconds.observe("lock_wait", time.perf_counter() - start)
+            yield
+
+    def ensure_logged_in(self):
+        """Log in while holding the lock, so a request arriving meanwhile cannot start a second login."""
+        with self._locked():
+            self.login()
+
+    @abstractmethod
+    def login(self):
+        ...
+
+    @abstractmethod
+    def search(self, query: str, category: int = None, sub_category: int = None) -> list[dict]:
+        ...
+
+    @abstractmethod
+    def latest(self, category: int, sub_category: int) -> list[dict]:
+        ...
+
+    @abstractmethod
+    def download(self, torrent_page_url: str) -> tuple[bytes | None, str | None]:
+        ...
+
+    def close(self):
+        pass
+
+
+def search_url(query: str, category: int = None, sub_category: int = None) -> str:
+    """YGG search URL, best-seeded results first."""
+    url = f"{YGG_BASE_URL}/engine/search?name={query.replace(' ', '+')}&do=search"
+    if category:
+        url += f"&category={category}"
+    if sub_category:
+        url += f"&sub_category={sub_category}"
+    return url + "&order=desc&sort=seed"
+
+
+def is_last_page(page_results: list[dict], query: str) -> bool:
+    """Pages come sorted by seeders: stop once one is short, drops below SEARCH_MIN_SEEDERS (every later page
+    would too) or has nothing matching the query."""
+    if len(page_results) < 50:
+        return True
+    if page_results[-1]["seeders"] < SEARCH_MIN_SEEDERS:
+        return True
+    return not any(matches_query(r["title"], query) for r in page_results)
+
+
+def use_local_backend():
+    """Called in the broker process, which owns the real backend even when BROKER_SOCKET is set."""
+    global _use_broker
+    _use_broker = False
+    get_backend.cache_clear()
+    get_jobs.cache_clear()
+
+
+@cache
+def get_broker_client():
+    from broker import BrokerClient
+    return BrokerClient(BROKER_SOCKET)
+
+
+@cache
+def get_backend() -> Backend:
+    if _use_broker:
+        from broker import BrokerBackend
+        return BrokerBackend(get_broker_client())
+    if BACKEND == "browser":
+        from browser import browser
+        return browser
+    if BACKEND == "http":
+        from http_backend import HTTPBackend
+        return HTTPBackend()
+    raise ValueError(f"Unknown BACKEND={BACKEND!r} (expected 'browser' or 'http')")
+
+
+class Jobs(NamedTuple):
+    """The jobs and caches that must exist once: in the broker when there is one, so that every worker shares them."""
+    rss_feed: Any
+    prefetcher: Any
+    search_episode: Callable[..., list[dict]]
+    empty_searches: Any
+    failed_downloads: Any
+
+
+@cache
+def get_jobs() -> Jobs:
+    if _use_broker:
+        from broker import RemoteObject
+        client = get_broker_client()
+        return Jobs(RemoteObject(client, "rss_feed"), RemoteObject(client, "prefetcher"),
+                    RemoteObject(client, "search").search_episode,
+                    RemoteObject(client, "empty_searches"), RemoteObject(client, "failed_downloads"))
+    from negative_cache import empty_searches, failed_downloads
+    from prefetch import prefetcher
+    from rss_feed import rss_feed
+    from search import search_episode
+    return Jobs(rss_feed, prefetcher, search_episode, empty_searches, failed_downloads)
+
+
+def wait_until_idle(stop):
+    """Hold a background job (prefetch, warming) while a request is using the backend, or until stop is set."""
+    while get_backend().busy and not stop.is_set():
+        stop.wait(IDLE_POLL_SECONDS)
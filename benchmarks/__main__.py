@@ -0,0 +1,125 @@
+"""Offline benchmarks for the CPU hot paths.
+
+    python -m benchmarks                          # run everything, print a table
+    python -m benchmarks --json results.json      # also write machine-readable results
+    python -m benchmarks --compare baseline.json  # exit 1 if a case is >20% slower than baseline
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+from benchmarks.fixtures import PASSKEY, load, save
+from crypto import encrypt, decrypt
+from scraper import parse_results_html, parse_size
+from torrent_cache import _bdecode, _bencode, strip_passkey, inject_passkey
+from torznab import caps_xml, search_xml
+
+SIZE_SAMPLES = ["1.37Go", "734.2Mo", "12,5 Go", "2.01To", "980Ko", "42", "n/a"]
+
+
+def _cases(pages: dict[str, str], torrents: dict[str, bytes]) -> dict[str, callable]:
+    cases = {}
+    for name, html in pages.items():
+        cases[f"parse_results[{name}]"] = lambda html=html: parse_results_html(html, "https://www.yggtorrent.org/")
+    cases["parse_size[x7]"] = lambda: [parse_size(s) for s in SIZE_SAMPLES]
+
+    for name, data in torrents.items():
+        meta = _bdecode(data)
+        stripped = strip_passkey(data)
+        encrypted = encrypt(stripped)
+        cases[f"bdecode[{name}]"] = lambda data=data: _bdecode(data)
+        cases[f"bencode[{name}]"] = lambda meta=meta: _bencode(meta)
+        cases[f"strip_passkey[{name}]"] = lambda data=data: strip_passkey(data)
+        cases[f"inject_passkey[{name}]"] = lambda stripped=stripped: inject_passkey(stripped, PASSKEY)
+        cases[f"encrypt[{name}]"] = lambda stripped=stripped: encrypt(stripped)
+        cases[f"decrypt[{name}]"] = lambda encrypted=encrypted: decrypt(encrypted)
+
+    results = parse_results_html(pages["page50"], "https://www.yggtorrent.org/")
+    results100 = (results * 2)[:100]
+    cases["search_xml[50]"] = lambda: search_xml(results, download_base="http://localhost:7474", apikey="key")
+    cases["search_xml[100]"] = lambda: search_xml(results100, download_base="http://localhost:7474", apikey="key")
+    cases["caps_xml"] = caps_xml
+    return cases
+
+
+def _measure(func, repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9))) if elapsed < min_time else number
+    per_op = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "min_s": min(per_op),
+        "median_s": statistics.median(per_op),
+        "mean_s": statistics.fmean(per_op),
+        "stdev_s": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "ops_per_s": 1 / statistics.median(per_op),
+    }
+
+
+def _fmt_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="YGGTorznab CPU benchmarks")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this string")
+    parser.add_argument("--fixtures", type=Path, help="directory of saved *.html / *.torrent fixtures to add")
+    parser.add_argument("--save-fixtures", type=Path, metavar="DIR", help="write the generated fixtures and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="target seconds per repeat")
+    parser.add_argument("--json", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare medians against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    if args.save_fixtures:
+        save(args.save_fixtures)
+        print(f"Fixtures written to {args.save_fixtures}")
+        return 0
+
+    pages, torrents = load(args.fixtures)
+    cases = {name: func for name, func in _cases(pages, torrents).items() if args.filter in name}
+
+    baseline = {}
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+
+    results = {}
+    regressions = []
+    width = max(len(name) for name in cases)
+    for name, func in cases.items():
+        results[name] = _measure(func, args.repeat, args.min_time)
+        line = f"{name:<{width}}  {_fmt_time(results[name]['median_s']):>10}  ±{_fmt_time(results[name]['stdev_s']):>10}"
+        if name in baseline:
+            ratio = results[name]["median_s"] / baseline[name]["median_s"]
+            results[name]["vs_baseline"] = ratio
+            line += f"  x{ratio:.2f}"
+            if ratio > args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line, flush=True)
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, indent=2), encoding="utf-8")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) over x{args.threshold}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
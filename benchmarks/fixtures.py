@@ -0,0 +1,140 @@
+"""Deterministic, real-shaped fixtures: YGG search pages and .torrent files."""
+import hashlib
+import html
+import random
+from pathlib import Path
+
+from torrent_cache import _bencode
+
+PASSKEY = "a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6"
+BASE_URL = "https://www.yggtorrent.org"
+
+_SHOWS = ["The Last of Us", "Les Revenants", "Dark", "Lupin", "Baron Noir", "Le Bureau des Légendes",
+          "Dune", "Oppenheimer", "Astérix & Obélix", "La Haine", "Kaamelott", "Engrenages"]
+_TAGS = ["MULTi", "FRENCH", "VOSTFR", "TRUEFRENCH", "VFF"]
+_QUALITIES = ["1080p.WEB.H264", "2160p.WEB-DL.DV.HDR.H265", "720p.HDTV.x264", "1080p.BluRay.x265.10bit"]
+_SUBCATS = ["2183", "2184", "2178", "2179"]
+_SIZE_UNITS = ["Mo", "Go", "Go", "To"]
+
+
+def _release_name(rng: random.Random, show: str | None = None,
+                  season: int | None = None, episode: int | None = None) -> str:
+    show = (show or rng.choice(_SHOWS)).replace(" ", ".")
+    if season is not None:
+        if episode is not None:
+            marker = f"S{season:02d}E{episode:02d}"
+        else:
+            marker = f"S{season:02d}E{rng.randint(1, 24):02d}" if rng.random() < 0.9 else f"S{season:02d}"
+    elif rng.random() < 0.6:
+        marker = f"S{rng.randint(1, 6):02d}E{rng.randint(1, 24):02d}" if rng.random() < 0.8 else f"S{rng.randint(1, 6):02d}"
+    else:
+        marker = str(rng.randint(1990, 2025))
+    return f"{show}.{marker}.{rng.choice(_TAGS)}.{rng.choice(_QUALITIES)}-GRP{rng.randint(1, 99)}"
+
+
+def _row(rng: random.Random, base_url: str, show: str | None, season: int | None, episode: int | None,
+         seeders: int | None = None) -> str:
+    torrent_id = rng.randint(100000, 1400000)
+    name = _release_name(rng, show, season, episode)
+    subcat = rng.choice(_SUBCATS)
+    slug = name.lower().replace(".", "+")
+    size = f"{rng.uniform(1, 999):.2f}{rng.choice(_SIZE_UNITS)}"
+    return f"""
+<tr>
+  <td><div class="hidden">{subcat}</div><span class="tag_subcat_{subcat}" title="Séries TV"></span></td>
+  <td><a id="torrent_name" href="{base_url}/torrent/filmvid%C3%A9o/s%C3%A9rie-tv/{torrent_id}-{html.escape(slug)}">{html.escape(name)}</a></td>
+  <td><a target="{torrent_id}" id="get_nfo"><img src="/assets/img/nfo.png" alt="nfo"></a></td>
+  <td>{rng.randint(0, 40)}</td>
+  <td><div class="hidden">{rng.randint(1500000000, 1760000000)}</div><span class="ico_clock-o"></span> il y a {rng.randint(1, 30)} jours</td>
+  <td>{size}</td>
+  <td>{rng.randint(0, 20000)}</td>
+  <td>{rng.randint(0, 3000) if seeders is None else seeders}</td>
+  <td>{rng.randint(0, 200)}</td>
+</tr>"""
+
+
+def search_page_html(rows: int = 50, seed: int = 0, show: str | None = None,
+                     season: int | None = None, episode: int | None = None,
+                     base_url: str = BASE_URL, logged_in: bool = True, seeders: list[int] | None = None) -> str:
+    """A results page; with show/season/episode set, every release name matches them. seeders, if given,
+    sets each row's seeder count (e.g. sorted, as with &sort=seed)."""
+    rng = random.Random(seed)
+    body = "".join(_row(rng, base_url, show, season, episode, seeders[i] if seeders else None)
+                   for i in range(rows))
+    account = ('<li><a href="/user/account">Mon compte</a></li><li><a href="/user/logout">Déconnexion</a></li>'
+               if logged_in else '<li><a href="/auth/login">Connexion</a></li>')
+    return f"""<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>YggTorrent - Recherche</title>
+<link rel="stylesheet" href="/assets/css/style.css"><script src="/assets/js/app.js"></script></head>
+<body>
+<header><nav><ul>{account}</ul></nav></header>
+<section id="#torrents"><div class="search-criteria"><h2>{rows} résultats trouvés</h2></div>
+<div class="table-responsive results">
+<table class="table">
+<thead><tr><th>Type</th><th>Nom du torrent</th><th>NFO</th><th>Comm.</th><th>Âge</th><th>Taille</th><th>Compl.</th><th>Seed</th><th>Leech</th></tr></thead>
+<tbody>{body}
+</tbody>
+</table></div>
+<ul class="pagination"><li><a href="/engine/search?name=x&amp;do=search&amp;page=50">2</a></li></ul>
+</section>
+<footer><p>YggTorrent</p></footer>
+</body></html>"""
+
+
+def torrent_file(num_files: int = 1, seed: int = 0, passkey: str = PASSKEY) -> bytes:
+    """A bencoded metainfo file; multi-file when num_files > 1 (e.g. a season pack)."""
+    rng = random.Random(seed)
+    announce = f"http://tracker.p2p-world.net:8080/{passkey}/announce".encode()
+    max_size = 2 * 1024**3 if num_files <= 100 else 300 * 1024**2
+    sizes = [rng.randint(20 * 1024**2, max_size) for _ in range(num_files)]
+    piece_length = 16 * 1024**2 if sum(sizes) > 8 * 1024**3 else 4 * 1024**2
+    pieces = -(-sum(sizes) // piece_length)
+    name = _release_name(rng)
+
+    info = {
+        b"name": name.encode(),
+        b"piece length": piece_length,
+        b"pieces": b"".join(hashlib.sha1(i.to_bytes(4, "big")).digest() for i in range(pieces)),
+        b"private": 1,
+        b"source": b"YGG",
+    }
+    if num_files == 1:
+        info[b"length"] = sizes[0]
+    else:
+        info[b"files"] = [
+            {b"length": size, b"path": [f"Saison {i // 500 + 1}".encode(), f"{name}.E{i + 1:04d}.mkv".encode()]}
+            for i, size in enumerate(sizes)
+        ]
+
+    return _bencode({
+        b"announce": announce,
+        b"announce-list": [[announce]],
+        b"comment": b"https://www.yggtorrent.org",
+        b"created by": b"mktorrent 1.1",
+        b"creation date": 1700000000,
+        b"info": info,
+    })
+
+
+TORRENT_SIZES = {"single": 1, "pack50": 50, "pack5000": 5000}
+
+
+def load(directory: Path | None = None) -> tuple[dict[str, str], dict[str, bytes]]:
+    """Generated fixtures, plus any saved *.html / *.torrent files from directory."""
+    pages = {"page50": search_page_html(50), "page10": search_page_html(10, seed=1)}
+    torrents = {name: torrent_file(n, seed=i) for i, (name, n) in enumerate(TORRENT_SIZES.items())}
+    if directory:
+        for path in sorted(Path(directory).glob("*.html")):
+            pages[path.stem] = path.read_text(encoding="utf-8")
+        for path in sorted(Path(directory).glob("*.torrent")):
+            torrents[path.stem] = path.read_bytes()
+    return pages, torrents
+
+
+def save(directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    pages, torrents = load()
+    for name, html in pages.items():
+        (directory / f"{name}.html").write_text(html, encoding="utf-8")
+    for name, data in torrents.items():
+        (directory / f"{name}.torrent").write_bytes(data)
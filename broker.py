@@ -0,0 +1,247 @@
+"""Browser broker: one process owns the backend (Chrome) and the jobs that drive it; API workers reach it over a
+Unix socket so that uvicorn can run several CPU-bound workers.
+
+    python broker.py                # standalone, listens on BROKER_SOCKET
+    WORKERS=4 python main.py        # main.py spawns the broker and points its workers at it
+"""
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from backend import Backend, BackendError
+from config import API_KEY, BROKER_SOCKET
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = "/tmp/yggtzn-broker.sock"
+RESTART_DELAY_MAX = 60
+
+# Everything a worker may call: target → methods and readable attributes
+_ALLOWED = {
+    "backend": {"ensure_logged_in", "search", "latest", "download", "passkey", "logged_in", "busy"},
+    "rss_feed": {"items", "__len__"},
+    "prefetcher": {"submit", "wait_for"},
+    "search": {"search_episode"},
+    "empty_searches": {"retry_after", "record", "clear"},
+    "failed_downloads": {"retry_after", "record", "clear"},
+    "metrics": {"render"},
+}
+
+
+def _authkey() -> bytes:
+    return API_KEY.encode()
+
+
+# --- Client side (API workers) ---
+
+class BrokerError(BackendError):
+    pass
+
+
+class _Connection(threading.local):
+    conn = None
+
+
+class BrokerClient:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = _Connection()
+
+    def call(self, target: str, name: str, *args, **kwargs):
+        for attempt in (1, 2):
+            try:
+                if self._local.conn is None:
+                    self._local.conn = Client(self.path, family="AF_UNIX", authkey=_authkey())
+                self._local.conn.send((target, name, args, kwargs))
+                status, value = self._local.conn.recv()
+                break
+            except (OSError, EOFError) as e:
+                self._local.conn = None
+                if attempt == 2:
+                    raise BrokerError(f"Broker unreachable at {self.path}: {e}") from e
+        if status == "error":
+            raise BrokerError(value)
+        return value
+
+
+class BrokerBackend(Backend):
+    """Backend living in the broker process."""
+
+    def __init__(self, client: BrokerClient):
+        self._client = client
+
+    @property
+    def passkey(self) -> str | None:
+        return self._client.call("backend", "passkey")
+
+    @property
+    def logged_in(self) -> bool:
+        return self._client.call("backend", "logged_in")
+
+    @property
+    def busy(self) -> bool:
+        return self._client.call("backend", "busy")
+
+    def ensure_logged_in(self):
+        return self._client.call("backend", "ensure_logged_in")
+
+    def login(self):
+        return self.ensure_logged_in()
+
+    def search(self, query: str, category: int = None, sub_category: int = None) -> list[dict]:
+        return self._client.call("backend", "search", query, category=category, sub_category=sub_category)
+
+    def latest(self, category: int, sub_category: int) -> list[dict]:
+        return self._client.call("backend", "latest", category, sub_category)
+
+    def download(self, torrent_page_url: str) -> tuple[bytes | None, str | None]:
+        return self._client.call("backend", "download", torrent_page_url)
+
+    def close(self):
+        pass  # the broker owns the browser's lifetime
+
+
+class RemoteObject:
+    """Forwards method calls to a named object in the broker (rss_feed, prefetcher, search, metrics)."""
+
+    def __init__(self, client: BrokerClient, target: str):
+        self._client = client
+        self._target = target
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self._client.call(self._target, name, *args, **kwargs)
+
+    def __len__(self) -> int:
+        return self._client.call(self._target, "__len__")
+
+
+# --- Server side ---
+
+def _handle(conn, targets: dict):
+    with conn:
+        while True:
+            try:
+                target, name, args, kwargs = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                if name not in _ALLOWED.get(target, ()):
+                    raise AttributeError(f"{target}.{name} is not exposed by the broker")
+                value = getattr(targets[target], name)
+                result = value(*args, **kwargs) if callable(value) else value
+                reply = ("ok", result)
+            except Exception as e:
+                log.warning("Broker call %s.%s failed: %s", target, name, e)
+                reply = ("error", f"{type(e).__name__}: {e}")
+            try:
+                conn.send(reply)
+            except (EOFError, OSError):
+                return
+
+
+def serve(path: str):
+    import backend as backend_module
+    import metrics
+    import search
+    from negative_cache import empty_searches, failed_downloads
+    from prefetch import prefetcher
+    from rss_feed import rss_feed
+    from warmer import warmer
+
+    backend_module.use_local_backend()
+    backend = backend_module.get_backend()
+    targets = {"backend": backend, "rss_feed": rss_feed, "prefetcher": prefetcher, "metrics": metrics,
+               "search": search, "empty_searches": empty_searches, "failed_downloads": failed_downloads}
+
+    def shutdown(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+
+    if os.path.exists(path):
+        os.unlink(path)
+    listener = Listener(path, family="AF_UNIX", authkey=_authkey())
+    os.chmod(path, 0o600)
+    log.info("Broker listening on %s", path)
+
+    def warm_up():
+        log.info("Logging in to YGG…")
+        try:
+            backend.ensure_logged_in()
+        except Exception as e:
+            log.error("Initial login failed: %s — will retry on first request", e)
+        rss_feed.start()
+        prefetcher.start()
+        warmer.start()
+
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                log.warning("Rejected broker connection: %s", e)
+                continue
+            threading.Thread(target=_handle, args=(conn, targets), name="broker-conn", daemon=True).start()
+    finally:
+        warmer.stop()
+        prefetcher.stop()
+        rss_feed.stop()
+        listener.close()
+        log.info("Shutting down backend…")
+        backend.close()
+
+
+class BrokerProcess:
+    """The broker child process, restarted whenever it exits until terminate() is called."""
+
+    def __init__(self, path: str):
+        self._args = [sys.executable, os.path.abspath(__file__), path]
+        self._env = {k: v for k, v in os.environ.items() if k != "BROKER_SOCKET"}
+        self._stop = threading.Event()
+        self._start()
+        threading.Thread(target=self._watch, name="broker-watch", daemon=True).start()
+
+    def _start(self):
+        self.proc = subprocess.Popen(self._args, env=self._env)
+        self._started_at = time.monotonic()
+
+    def _watch(self):
+        delay = 1
+        while not self._stop.wait(delay):
+            code = self.proc.poll()
+            if code is None or self._stop.is_set():
+                continue
+            # Back off when the broker keeps dying right after starting (e.g. Chrome cannot launch)
+            delay = min(delay * 2, RESTART_DELAY_MAX) if time.monotonic() - self._started_at < 30 else 1
+            log.error("Broker exited with code %s, restarting", code)
+            self._start()
+
+    def terminate(self):
+        self._stop.set()
+        self.proc.terminate()
+
+    def wait(self, timeout: float | None = None) -> int:
+        return self.proc.wait(timeout)
+
+
+def spawn() -> BrokerProcess:
+    """Start the broker as a supervised child process and point this process' future workers at it."""
+    path = BROKER_SOCKET or DEFAULT_SOCKET
+    broker_process = BrokerProcess(path)
+    os.environ["BROKER_SOCKET"] = path
+    return broker_process
+
+
+if __name__ == "__main__":
+    from config import DEBUG
+
+    logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    serve(sys.argv[1] if len(sys.argv) > 1 else BROKER_SOCKET or DEFAULT_SOCKET)
@@ -2,22 +2,43 @@ import glob
 import json
 import logging
 import os
-import re
 import threading
 from pathlib import Path
-from seleniumbase import SB
-from seleniumbase.core.download_helper import get_downloads_folder
-from config import YGG_USERNAME, YGG_PASSWORD, YGG_BASE_URL, HEADLESS, MAX_SEARCH_PAGES
+from backend import Backend, BackendError, is_last_page, search_url
+from config import (
+    YGG_USERNAME, YGG_PASSWORD, YGG_BASE_URL, HEADLESS, MAX_SEARCH_PAGES, DATA_DIR,
+    BROWSER_MAX_NAVIGATIONS, BROWSER_MAX_MEMORY_MB, BROWSER_WATCHDOG_INTERVAL, DEBUG_SCREENSHOTS,
+)
+from debug_capture import debug_capture
+from metrics import Gauge, events, timed
+from scraper import blocked_reason, parse_results_html
 
 log = logging.getLogger(__name__)
 
-COOKIES_PATH = Path(__file__).parent / "cookies.json"
-PASSKEY_PATH = Path(__file__).parent / "passkey.txt"
-DEBUG_DIR = Path(__file__).parent / "data"
+COOKIES_PATH = Path(__file__).parent / DATA_DIR / "cookies.json"
+PASSKEY_PATH = Path(__file__).parent / DATA_DIR / "passkey.txt"
 LOGIN_RETRIES = 3
 
 
-class YGGBrowser:
+def _chrome_memory_mb() -> int:
+    """Sum the resident memory of every Chrome/chromedriver process (Linux only)."""
+    total_kb = 0
+    for status in glob.glob("/proc/[0-9]*/status"):
+        try:
+            with open(status, encoding="utf-8") as f:
+                name = f.readline().partition(":")[2].strip()
+                if not name.startswith("chrome"):
+                    continue
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError, IndexError):
+            continue
+    return total_kb // 1024
+
+
+class YGGBrowser(Backend):
     _instance = None
 
     def __new__(cls):
@@ -28,11 +49,19 @@ class YGGBrowser:
             cls._instance._sb_context = None
             cls._instance._lock = threading.Lock()
             cls._instance.passkey = None
+            cls._instance.navigations = 0
+            cls._instance.memory_baseline_mb = 0
+            cls._instance._watchdog = None
+            cls._instance._watchdog_stop = threading.Event()
         return cls._instance
 
     def _start_browser(self):
         if self.sb:
             return
+        # Imported here: seleniumbase takes most of a second to import and is only needed once Chrome starts
+        from seleniumbase import SB
+        from seleniumbase.core.download_helper import get_downloads_folder
+
         self._download_dir = get_downloads_folder()
         os.makedirs(self._download_dir, exist_ok=True)
         log.info("Starting SeleniumBase UC browser (downloads → %s)…", self._download_dir)
@@ -43,7 +72,68 @@ class YGGBrowser:
             chromium_arg="--no-sandbox,--disable-dev-shm-usage,--disable-gpu",
         )
         self.sb = self._sb_context.__enter__()
+        self.navigations = 0
+        self._start_watchdog()
+
+    def _stop_browser(self):
+        if self._sb_context:
+            try:
+                self._sb_context.__exit__(None, None, None)
+            except Exception:
+                pass
+        self.sb = None
+        self._sb_context = None
+        self.logged_in = False
+
+    # --- Recycling watchdog ---
+
+    def _start_watchdog(self):
+        if BROWSER_WATCHDOG_INTERVAL <= 0 or (self._watchdog and self._watchdog.is_alive()):
+            return
+        self._watchdog_stop.clear()
+        self._watchdog = threading.Thread(target=self._watchdog_loop, name="browser-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def _watchdog_loop(self):
+        # Recycling only happens here, between requests, never on a request's own critical path
+        while not self._watchdog_stop.wait(BROWSER_WATCHDOG_INTERVAL):
+            # Waiting on the lock drains the in-flight search/download first
+            with self._lock:
+                if self.sb:
+                    self._maybe_recycle()
+
+    def _recycle_reason(self) -> str | None:
+        if BROWSER_MAX_NAVIGATIONS and self.navigations >= BROWSER_MAX_NAVIGATIONS:
+            return f"{self.navigations} navigations"
+        # Compared with what Chrome needed right after login: a restart cannot reclaim that part
+        if BROWSER_MAX_MEMORY_MB and self.logged_in:
+            growth_mb = _chrome_memory_mb() - self.memory_baseline_mb
+            if growth_mb >= BROWSER_MAX_MEMORY_MB:
+                return f"{growth_mb} MB grown since login"
+        return None
+
+    def _maybe_recycle(self):
+        """Restart Chrome if a threshold is exceeded. Caller must hold the lock."""
+        if not self.sb:
+            return
+        reason = self._recycle_reason()
+        if not reason:
+            return
 
+        log.info("Recycling browser (%s)…", reason)
+        events.inc("browser_recycle")
+        if self.logged_in:
+            try:
+                self._save_cookies()
+            except Exception as e:
+                log.warning("Failed to save cookies before recycling: %s", e)
+        self._stop_browser()
+        try:
+            self.login()
+        except Exception as e:
+            log.error("Login after recycling failed: %s — will retry on next request", e)
+
+    @timed("cf_handle")
     def _handle_cf(self):
         try:
             self.sb.uc_gui_handle_cf()
@@ -54,12 +144,16 @@ class YGGBrowser:
     def _open_with_cf(self, url, reconnect_time=10):
         if url.rstrip("/") != YGG_BASE_URL.rstrip("/"):
             log.debug("Navigating to homepage first for CF clearance")
-            self.sb.uc_open_with_reconnect(YGG_BASE_URL, reconnect_time=reconnect_time)
-            self.sb.sleep(2)
+            with timed("homepage_hop"):
+                self.sb.uc_open_with_reconnect(YGG_BASE_URL, reconnect_time=reconnect_time)
+                self.navigations += 1
+                self.sb.sleep(2)
             self._handle_cf()
 
-        self.sb.uc_open_with_reconnect(url, reconnect_time=reconnect_time)
-        self.sb.sleep(2)
+        with timed("page_load"):
+            self.sb.uc_open_with_reconnect(url, reconnect_time=reconnect_time)
+            self.navigations += 1
+            self.sb.sleep(2)
         self._handle_cf()
         self._dismiss_popup()
 
@@ -133,19 +227,29 @@ class YGGBrowser:
         page = self.sb.get_page_source()
         return "Mon compte" in page
 
-    def _save_debug(self, name):
+    def _save_debug(self, name, page_source: str | None = None):
+        """Hand a snapshot to the background writer; pass page_source when the caller already has it."""
+        if not debug_capture.should_capture(name):
+            return
         try:
-            os.makedirs(DEBUG_DIR, exist_ok=True)
-            self.sb.save_screenshot(str(DEBUG_DIR / f"{name}.png"))
-            src = self.sb.get_page_source()[:1000]
-            log.warning("Debug [%s] URL=%s page_source=%.500s", name, self.sb.get_current_url(), src)
+            url = self.sb.get_current_url()
+            if page_source is None:
+                page_source = self.sb.get_page_source()
+            screenshot = self.sb.driver.get_screenshot_as_base64() if DEBUG_SCREENSHOTS else None
         except Exception as e:
-            log.warning("Could not save debug info: %s", e)
+            log.warning("Could not capture debug info: %s", e)
+            return
+        debug_capture.submit(name, url, page_source, screenshot)
 
     def login(self):
         if self.logged_in:
             return
+        self._login()
+        if self.logged_in:
+            self.memory_baseline_mb = _chrome_memory_mb()
+            log.debug("Chrome uses %d MB after login", self.memory_baseline_mb)
 
+    def _login(self):
         self._start_browser()
 
         if self._load_cookies():
@@ -198,120 +302,126 @@ class YGGBrowser:
             log.error("Login failed — 'Mon compte' not found on page")
 
     def search(self, query: str, category: int = None, sub_category: int = None) -> list[dict]:
-        with self._lock:
+        with self._locked():
             if not self.logged_in:
                 self.login()
 
-            search_query = query.replace(" ", "+")
-            base_url = f"{YGG_BASE_URL}/engine/search?name={search_query}&do=search"
-            if category:
-                base_url += f"&category={category}"
-            if sub_category:
-                base_url += f"&sub_category={sub_category}"
+            base_url = search_url(query, category, sub_category)
 
             all_results = []
             for page_num in range(MAX_SEARCH_PAGES):
                 page_url = base_url if page_num == 0 else f"{base_url}&page={page_num * 50}"
                 log.info("Searching page %d: %s", page_num + 1, page_url)
+                events.inc("search_page")
                 self._open_with_cf(page_url, reconnect_time=6)
 
                 if page_num == 0:
                     session_ok = self._check_session()
                     if not self.logged_in:
-                        log.error("Could not restore session, aborting search")
-                        return []
+                        raise BackendError("Could not restore session, aborting search")
                     if not session_ok:
                         log.info("Re-navigating to search page after re-login")
                         self._open_with_cf(page_url, reconnect_time=6)
 
-                page_results = self._parse_results()
+                try:
+                    page_results = self._parse_results()
+                except BackendError as e:
+                    if page_num == 0:
+                        raise
+                    log.warning("Stopping pagination, keeping %d results: %s", len(all_results), e)
+                    break
                 all_results.extend(page_results)
 
-                if len(page_results) < 50:
+                if is_last_page(page_results, query):
                     break
 
             log.info("Found %d total results across %d page(s)", len(all_results), page_num + 1)
             return all_results
 
+    def latest(self, category: int, sub_category: int) -> list[dict]:
+        """Return the first page of newest uploads for a sub-category."""
+        with self._locked():
+            if not self.logged_in:
+                self.login()
+
+            page_url = (f"{YGG_BASE_URL}/engine/search?name=&do=search&category={category}"
+                        f"&sub_category={sub_category}&order=desc&sort=publish_date")
+            log.info("Fetching latest uploads: %s", page_url)
+            self._open_with_cf(page_url, reconnect_time=6)
+
+            session_ok = self._check_session()
+            if not self.logged_in:
+                raise BackendError("Could not restore session, aborting latest uploads fetch")
+            if not session_ok:
+                self._open_with_cf(page_url, reconnect_time=6)
+
+            return self._parse_results()
+
     def _check_session(self) -> bool:
         """Return True if session was valid, False if re-login was needed."""
         page = self.sb.get_page_source()
         if "Mon compte" not in page:
             log.warning("Session expired — re-logging in")
-            self._save_debug("session_expired")
+            self._save_debug("session_expired", page)
             self.logged_in = False
             self.login()
             return False
         return True
 
+    @timed("parse_results")
     def _parse_results(self) -> list[dict]:
-        results = []
-        rows = self.sb.find_elements("table.table tbody tr")
-        if not rows:
-            log.warning("No table rows found on search page — URL: %s", self.sb.get_current_url())
-            self._save_debug("no_results")
-        for row in rows:
-            try:
-                cols = row.find_elements("css selector", "td")
-                if len(cols) < 9:
-                    continue
-
-                cat_div = cols[0].find_element("css selector", "div.hidden")
-                subcat = cat_div.get_attribute("textContent").strip()
-
-                name_el = cols[1].find_element("css selector", "a#torrent_name")
-                title = name_el.text.strip()
-                link = name_el.get_attribute("href")
-
-                match = re.search(r"/(\d+)-", link)
-                torrent_id = match.group(1) if match else ""
-
-                size = self._parse_size(cols[5].text.strip())
-                seeders = int(cols[7].text.strip())
-                leechers = int(cols[8].text.strip())
-
-                results.append({
-                    "title": title,
-                    "link": link,
-                    "torrent_id": torrent_id,
-                    "size": size,
-                    "seeders": seeders,
-                    "leechers": leechers,
-                    "subcat": subcat,
-                })
-            except Exception as e:
-                log.debug("Skipping row: %s", e)
-                continue
+        page = self.sb.get_page_source()
+        results = parse_results_html(page, self.sb.get_current_url())
+        if results is None:
+            reason = blocked_reason(page)
+            if reason:
+                self._save_debug("no_results", page)
+                raise BackendError(f"Search page unusable ({reason}): {self.sb.get_current_url()}")
+            log.info("No results on search page — URL: %s", self.sb.get_current_url())
+            return []
         return results
 
     def download(self, torrent_page_url: str) -> bytes | None:
-        with self._lock:
+        with self._locked():
             if not self.logged_in:
                 self.login()
 
             log.info("Opening torrent page: %s", torrent_page_url)
             self._open_with_cf(torrent_page_url, reconnect_time=6)
 
+            page = self.sb.get_page_source()
+            reason = blocked_reason(page)
+            if reason:
+                self._save_debug("download_blocked", page)
+                if reason == "not logged in":
+                    self.logged_in = False
+                raise BackendError(f"Torrent page unusable ({reason}): {torrent_page_url}")
+            if not self.sb.is_element_present('#download-timer-btn'):
+                log.error("No download button on %s — torrent removed?", torrent_page_url)
+                return None, None
+
             for f in glob.glob(os.path.join(self._download_dir, "*.torrent")):
                 os.remove(f)
 
             self.sb.click('#download-timer-btn')
             log.info("Waiting for download timer…")
 
-            self.sb.wait_for_element('#downloadTimerLink.ready', timeout=35)
-            self.sb.wait_for_element_not_visible('#downloadTimerLink[style*="display: none"]', timeout=5)
-            self.sb.sleep(1)
+            with timed("download_timer"):
+                self.sb.wait_for_element('#downloadTimerLink.ready', timeout=35)
+                self.sb.wait_for_element_not_visible('#downloadTimerLink[style*="display: none"]', timeout=5)
+                self.sb.sleep(1)
 
             self.sb.click('#downloadTimerLink')
             log.info("Clicked download link, waiting for file…")
 
             torrent_file = None
-            for _ in range(15):
-                self.sb.sleep(1)
-                files = glob.glob(os.path.join(self._download_dir, "*.torrent"))
-                if files:
-                    torrent_file = files[0]
-                    break
+            with timed("download_file_wait"):
+                for _ in range(15):
+                    self.sb.sleep(1)
+                    files = glob.glob(os.path.join(self._download_dir, "*.torrent"))
+                    if files:
+                        torrent_file = files[0]
+                        break
 
             if not torrent_file:
                 log.error("No .torrent file found in %s", self._download_dir)
@@ -323,31 +433,14 @@ class YGGBrowser:
             log.info("Downloaded %s (%d bytes)", filename, len(data))
             return data, filename
 
-    @staticmethod
-    def _parse_size(text: str) -> int:
-        text = text.upper().replace(",", ".").strip()
-        multipliers = {"KO": 1024, "KB": 1024, "MO": 1024**2, "MB": 1024**2,
-                       "GO": 1024**3, "GB": 1024**3, "TO": 1024**4, "TB": 1024**4}
-        for suffix, mult in multipliers.items():
-            if suffix in text:
-                try:
-                    return int(float(text.replace(suffix, "").strip()) * mult)
-                except ValueError:
-                    return 0
-        try:
-            return int(text)
-        except ValueError:
-            return 0
-
     def close(self):
-        if self._sb_context:
-            try:
-                self._sb_context.__exit__(None, None, None)
-            except Exception:
-                pass
-            self.sb = None
-            self._sb_context = None
-            self.logged_in = False
+        self._watchdog_stop.set()
+        with self._lock:
+            self._stop_browser()
 
 
 browser = YGGBrowser()
+
+Gauge("yggtzn_browser_running", "1 if Chrome is running.", lambda: browser.sb is not None)
+Gauge("yggtzn_browser_navigations", "Navigations since Chrome was last (re)started.", lambda: browser.navigations)
+Gauge("yggtzn_browser_memory_bytes", "Resident memory of Chrome processes.", lambda: _chrome_memory_mb() * 1024 * 1024)
@@ -8,6 +8,37 @@ YGG_PASSWORD = os.getenv("YGG_PASSWORD", "")
 API_KEY = os.getenv("API_KEY", "changeme")
 HEADLESS = os.getenv("HEADLESS", "true").lower() in ("true", "1", "yes")
 MAX_SEARCH_PAGES = int(os.getenv("MAX_SEARCH_PAGES", "3"))
+SEARCH_MIN_SEEDERS = int(os.getenv("SEARCH_MIN_SEEDERS", "1"))
 TMDB_API_KEY = os.getenv("TMDB_API_KEY", "")
+TMDB_CACHE_TTL = int(os.getenv("TMDB_CACHE_TTL", "86400"))
+BROWSER_MAX_NAVIGATIONS = int(os.getenv("BROWSER_MAX_NAVIGATIONS", "500"))
+BROWSER_MAX_MEMORY_MB = int(os.getenv("BROWSER_MAX_MEMORY_MB", "1500"))
+BROWSER_WATCHDOG_INTERVAL = int(os.getenv("BROWSER_WATCHDOG_INTERVAL", "60"))
+SEASON_SEARCH = os.getenv("SEASON_SEARCH", "false").lower() in ("true", "1", "yes")
+SEASON_CACHE_TTL = int(os.getenv("SEASON_CACHE_TTL", "1800"))
+RSS_POLL_INTERVAL = int(os.getenv("RSS_POLL_INTERVAL", "0"))
+RSS_INDEX_SIZE = int(os.getenv("RSS_INDEX_SIZE", "500"))
+RESULT_INDEX_TTL = int(os.getenv("RESULT_INDEX_TTL", "0"))
+RESULT_INDEX_REFRESH = int(os.getenv("RESULT_INDEX_REFRESH", "900"))
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "0"))
+PREFETCH_BUDGET_PER_HOUR = int(os.getenv("PREFETCH_BUDGET_PER_HOUR", "20"))
 DEBUG = os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
-YGG_BASE_URL = "https://www.yggtorrent.org"
+DEBUG_CAPTURE_INTERVAL = int(os.getenv("DEBUG_CAPTURE_INTERVAL", "60"))
+DEBUG_CAPTURE_SAMPLE = float(os.getenv("DEBUG_CAPTURE_SAMPLE", "1"))
+DEBUG_SCREENSHOTS = os.getenv("DEBUG_SCREENSHOTS", "false").lower() in ("true", "1", "yes")
+DEBUG_DIR_MAX_MB = int(os.getenv("DEBUG_DIR_MAX_MB", "50"))
+YGG_BASE_URL = os.getenv("YGG_BASE_URL", "https://www.yggtorrent.org").rstrip("/")
+CACHE_API_URL = os.getenv("CACHE_API_URL", "http://89.168.52.228").rstrip("/")
+BACKEND = os.getenv("BACKEND", "browser")
+BROKER_SOCKET = os.getenv("BROKER_SOCKET", "")
+WORKERS = int(os.getenv("WORKERS", "1"))
+PORT = int(os.getenv("PORT", "7474"))
+NODES = [n.strip().rstrip("/") for n in os.getenv("NODES", "").split(",") if n.strip()]
+FRONTEND_PORT = int(os.getenv("FRONTEND_PORT", "7475"))
+FRONTEND_CACHE_TTL = int(os.getenv("FRONTEND_CACHE_TTL", "600"))
+DATA_DIR = os.getenv("DATA_DIR", "data")
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", "300"))
+NEGATIVE_CACHE_MAX_TTL = int(os.getenv("NEGATIVE_CACHE_MAX_TTL", "21600"))
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", os.path.join(DATA_DIR, "watchlist.json"))
+WARM_HOURS = os.getenv("WARM_HOURS", "3-6")
+WARM_AIR_OFFSETS = os.getenv("WARM_AIR_OFFSETS", "30,90,180")
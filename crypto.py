@@ -1,22 +1,29 @@
 import hashlib
 import os
+from functools import cache
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+from metrics import timed
+
 _PROJECT_SEED = b"yggtzn:torrent-cache:v1"
 _SALT = b"yggtzn-cache-encryption-salt-2024"
 
 def _derive_key() -> bytes:
     return hashlib.pbkdf2_hmac("sha256", _PROJECT_SEED, _SALT, 600_000)
 
-_KEY = _derive_key()
-_AESGCM = AESGCM(_KEY)
+# Derived on first use: 600k PBKDF2 rounds cost about half a second of CPU
+@cache
+def _aesgcm() -> AESGCM:
+    return AESGCM(_derive_key())
 
+@timed("encrypt")
 def encrypt(data: bytes) -> bytes:
     nonce = os.urandom(12)
-    ciphertext = _AESGCM.encrypt(nonce, data, None)
+    ciphertext = _aesgcm().encrypt(nonce, data, None)
     return nonce + ciphertext
 
+@timed("decrypt")
 def decrypt(data: bytes) -> bytes:
     nonce, ciphertext = data[:12], data[12:]
-    return _AESGCM.decrypt(nonce, ciphertext, None)
+    return _aesgcm().decrypt(nonce, ciphertext, None)
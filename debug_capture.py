@@ -0,0 +1,84 @@
+import base64
+import logging
+import queue
+import random
+import threading
+import time
+from pathlib import Path
+
+from config import DATA_DIR, DEBUG_CAPTURE_INTERVAL, DEBUG_CAPTURE_SAMPLE, DEBUG_DIR_MAX_MB
+from metrics import events
+
+log = logging.getLogger(__name__)
+
+DEBUG_DIR = Path(__file__).parent / DATA_DIR / "debug"
+QUEUE_SIZE = 16
+
+
+class DebugCapture:
+    """Writes debug snapshots (page source, optional screenshot) from a background thread.
+
+    Captures are sampled and rate-limited per name, so a Cloudflare storm costs one snapshot per interval
+    rather than one per request; the directory is trimmed oldest-first to max_mb.
+    """
+
+    def __init__(self, directory: Path, interval: int, sample: float, max_mb: int):
+        self.directory = directory
+        self.interval = interval
+        self.sample = sample
+        self.max_bytes = max_mb * 1024 * 1024
+        self._last: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = None
+
+    def should_capture(self, name: str) -> bool:
+        if self.sample <= 0 or random.random() >= self.sample:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last.get(name, -self.interval) < self.interval:
+                return False
+            self._last[name] = now
+        return True
+
+    def submit(self, name: str, url: str, source: str, screenshot_b64: str | None = None):
+        log.warning("Debug [%s] URL=%s page_source=%.500s", name, url, source)
+        with self._lock:
+            if not self._thread:
+                self._thread = threading.Thread(target=self._loop, name="debug-capture", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((name, url, source, screenshot_b64))
+        except queue.Full:
+            events.inc("debug_capture_dropped")
+            return
+        events.inc("debug_capture")
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                self._write(*item)
+                self._rotate()
+            except Exception as e:
+                log.warning("Could not save debug info: %s", e)
+
+    def _write(self, name: str, url: str, source: str, screenshot_b64: str | None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}_{name}"
+        (self.directory / f"{stem}.html").write_text(f"<!-- {url} -->\n{source}", encoding="utf-8")
+        if screenshot_b64:
+            (self.directory / f"{stem}.png").write_bytes(base64.b64decode(screenshot_b64))
+
+    def _rotate(self):
+        files = sorted((p.stat().st_mtime, p.stat().st_size, p) for p in self.directory.iterdir() if p.is_file())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+debug_capture = DebugCapture(DEBUG_DIR, DEBUG_CAPTURE_INTERVAL, DEBUG_CAPTURE_SAMPLE, DEBUG_DIR_MAX_MB)
@@ -7,12 +7,8 @@ pkill -f "Xvfb" 2>/dev/null || true
 pkill -f "chrome" 2>/dev/null || true
 sleep 1
 
-# Persistent cookies via volume
+# Cookies, passkey and caches persist in the data volume (DATA_DIR)
 mkdir -p /app/data
-if [ ! -f /app/data/cookies.json ]; then
-    echo "[]" > /app/data/cookies.json
-fi
-ln -sf /app/data/cookies.json /app/cookies.json
 
 # Start Xvfb virtual display
 Xvfb :99 -screen 0 1920x1080x24 -nolisten tcp -ac &
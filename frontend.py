@@ -0,0 +1,212 @@
+"""Front end sharding Torznab traffic across several YGGTorznab nodes (one YGG account each).
+
+    NODES=http://node1:7474,http://node2:7474 python frontend.py
+
+Queries are routed by consistent hashing so that repeated searches for a show land on the node whose caches are
+warm; downloads are routed by torrent ID. Each node serves torrents from the shared torrent cache with its own
+passkey. Nodes that fail are skipped until a health check sees them again.
+"""
+import bisect
+import hashlib
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import requests
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse
+
+from backend import UNAVAILABLE_HEADER
+from config import API_KEY, DEBUG, NODES, FRONTEND_PORT, FRONTEND_CACHE_TTL
+from torrent_cache import make_cache_key
+from torznab import caps_xml
+
+logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+log = logging.getLogger(__name__)
+
+HEALTH_INTERVAL = 30
+NODE_TIMEOUT = 300
+RING_REPLICAS = 100
+
+
+def _hash(key: str) -> int:
+    return int(hashlib.md5(key.encode()).hexdigest()[:16], 16)
+
+
+class HashRing:
+    def __init__(self, nodes: list[str], replicas: int = RING_REPLICAS):
+        self.nodes = nodes
+        self._ring = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas))
+        self._keys = [h for h, _ in self._ring]
+
+    def preference(self, key: str) -> list[str]:
+        """All nodes, starting with the owner of key and continuing clockwise (failover order)."""
+        order = []
+        start = bisect.bisect(self._keys, _hash(key))
+        for i in range(len(self._ring)):
+            node = self._ring[(start + i) % len(self._ring)][1]
+            if node not in order:
+                order.append(node)
+                if len(order) == len(self.nodes):
+                    break
+        return order
+
+
+class Cluster:
+    def __init__(self, nodes: list[str]):
+        self.ring = HashRing(nodes)
+        self._down: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, key: str) -> list[str]:
+        order = self.ring.preference(key)
+        with self._lock:
+            healthy = [n for n in order if n not in self._down]
+        # If every node looks down, still try them all rather than failing outright
+        return healthy or order
+
+    def mark_down(self, node: str):
+        with self._lock:
+            if node not in self._down:
+                log.warning("Node %s marked down", node)
+            self._down[node] = time.monotonic()
+
+    def mark_up(self, node: str):
+        with self._lock:
+            if self._down.pop(node, None) is not None:
+                log.info("Node %s is back up", node)
+
+    def check_health(self):
+        for node in self.ring.nodes:
+            try:
+                resp = requests.get(f"{node}/ready", timeout=5)
+                ok = resp.status_code == 200
+            except requests.RequestException:
+                ok = False
+            if ok:
+                self.mark_up(node)
+            else:
+                self.mark_down(node)
+
+    def forward(self, key: str, path: str, params: dict, headers: dict) -> requests.Response | None:
+        for node in self.candidates(key):
+            try:
+                resp = requests.get(f"{node}{path}", params=params, headers=headers, timeout=NODE_TIMEOUT)
+            except requests.RequestException as e:
+                log.warning("Node %s failed for %s: %s", node, path, e)
+                self.mark_down(node)
+                continue
+            # Only a node that cannot reach YGG is skipped; other errors (e.g. a removed torrent) would fail everywhere
+            if resp.status_code == 503 and UNAVAILABLE_HEADER in resp.headers:
+                log.warning("Node %s cannot reach YGG for %s, trying next node", node, path)
+                self.mark_down(node)
+                continue
+            log.debug("Routed %s key=%r to %s", path, key, node)
+            return resp
+        return None
+
+
+class ResultCache:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: dict[tuple, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] <= self.ttl:
+                return entry[1]
+            self._entries.pop(key, None)
+            return None
+
+    def put(self, key: tuple, body: bytes):
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for k in [k for k, (t, _) in self._entries.items() if now - t > self.ttl]:
+                del self._entries[k]
+            self._entries[key] = (now, body)
+
+
+cluster = Cluster(NODES)
+result_cache = ResultCache(FRONTEND_CACHE_TTL)
+
+
+def _health_loop():
+    # Nodes start out healthy; request failures mark them down in between checks
+    while True:
+        time.sleep(HEALTH_INTERVAL)
+        cluster.check_health()
+
+
+def _routing_key(params: dict) -> str:
+    # Season, not episode: every episode request of a season goes to the node holding the season search
+    for id_param in ("imdbid", "tmdbid", "tvdbid"):
+        if params.get(id_param):
+            return f"{id_param}:{params[id_param]}:{params.get('season', '')}"
+    return f"q:{' '.join(params.get('q', '').lower().split())}:{params.get('season', '')}"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log.info("Front end for %d node(s): %s", len(NODES), ", ".join(NODES))
+    threading.Thread(target=_health_loop, name="health", daemon=True).start()
+    yield
+
+
+app = FastAPI(title="YGGTorznab front end", lifespan=lifespan)
+
+
+def _forward_headers(request: Request) -> dict:
+    # Keep the client-facing Host so nodes build enclosure URLs pointing back at the front end
+    return {"Host": request.headers.get("host", "")}
+
+
+@app.get("/api")
+def torznab_api(request: Request):
+    params = dict(request.query_params)
+    if params.get("apikey") != API_KEY:
+        return PlainTextResponse("Unauthorized", status_code=401)
+    if params.get("t") == "caps":
+        return Response(content=caps_xml(), media_type="application/xml")
+
+    cache_key = (request.headers.get("host", ""),) + tuple(sorted((k, v) for k, v in params.items() if k != "apikey"))
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/xml")
+
+    resp = cluster.forward(_routing_key(params), "/api", params, _forward_headers(request))
+    if resp is None:
+        return PlainTextResponse("No node available", status_code=503)
+    if resp.status_code == 200:
+        result_cache.put(cache_key, resp.content)
+    return Response(content=resp.content, status_code=resp.status_code,
+                    media_type=resp.headers.get("Content-Type", "application/xml"))
+
+
+@app.get("/download")
+def download_torrent(request: Request):
+    params = dict(request.query_params)
+    if params.get("apikey") != API_KEY:
+        return PlainTextResponse("Unauthorized", status_code=401)
+    if not params.get("url"):
+        return PlainTextResponse("Missing url", status_code=400)
+
+    resp = cluster.forward(f"torrent:{make_cache_key(params['url'])}", "/download", params, _forward_headers(request))
+    if resp is None:
+        return PlainTextResponse("No node available", status_code=503)
+    headers = {}
+    if "Content-Disposition" in resp.headers:
+        headers["Content-Disposition"] = resp.headers["Content-Disposition"]
+    return Response(content=resp.content, status_code=resp.status_code, headers=headers,
+                    media_type=resp.headers.get("Content-Type", "application/x-bittorrent"))
+
+
+if __name__ == "__main__":
+    import uvicorn
+    if not NODES:
+        raise SystemExit("NODES is empty: set NODES=http://node1:7474,http://node2:7474")
+    uvicorn.run(app, host="0.0.0.0", port=FRONTEND_PORT)
@@ -0,0 +1,127 @@
+import logging
+import re
+import threading
+import time
+
+import requests
+
+from backend import Backend, BackendError, is_last_page, search_url
+from config import YGG_USERNAME, YGG_PASSWORD, YGG_BASE_URL, MAX_SEARCH_PAGES
+from metrics import timed
+from scraper import CF_MARKERS, blocked_reason, parse_results_html
+
+log = logging.getLogger(__name__)
+
+CF_RETRIES = 3
+
+
+class HTTPBackend(Backend):
+    """Plain-HTTP client for YGG-compatible sites without a real Cloudflare challenge,
+    such as the bundled stand-in (python -m loadtest.fake_ygg)."""
+
+    def __init__(self):
+        self.passkey = None
+        self.logged_in = False
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        for attempt in range(CF_RETRIES):
+            with timed("page_load"):
+                resp = self._session.get(url, timeout=30, **kwargs)
+            if not any(m.encode() in resp.content[:2000] for m in CF_MARKERS):
+                return resp
+            log.debug("CF interstitial on %s (attempt %d/%d)", url, attempt + 1, CF_RETRIES)
+            with timed("cf_handle"):
+                time.sleep(1)
+        return resp
+
+    def login(self):
+        if self.logged_in:
+            return
+        self._get(f"{YGG_BASE_URL}/auth/login")
+        self._session.post(f"{YGG_BASE_URL}/auth/process_login",
+                           data={"id": YGG_USERNAME, "pass": YGG_PASSWORD}, timeout=30)
+        if "Mon compte" not in self._get(YGG_BASE_URL).text:
+            log.error("Login failed — 'Mon compte' not found on page")
+            return
+        self.logged_in = True
+        match = re.search(r'id="profile_passkey"[^>]*>\s*([^<\s]+)', self._get(f"{YGG_BASE_URL}/user/account").text)
+        if match:
+            self.passkey = match.group(1)
+        log.info("Login successful (passkey %s…)", (self.passkey or "")[:6])
+
+    def _search_page(self, url: str) -> list[dict]:
+        resp = self._get(url)
+        if "Mon compte" not in resp.text:
+            log.warning("Session expired — re-logging in")
+            self.logged_in = False
+            self.login()
+            resp = self._get(url)
+            reason = blocked_reason(resp.text)
+            if reason:
+                raise BackendError(f"Search page unusable ({reason}): {url}")
+        with timed("parse_results"):
+            return parse_results_html(resp.text, resp.url) or []
+
+    def search(self, query: str, category: int = None, sub_category: int = None) -> list[dict]:
+        with self._locked():
+            self.login()
+            base_url = search_url(query, category, sub_category)
+
+            all_results = []
+            for page_num in range(MAX_SEARCH_PAGES):
+                page_url = base_url if page_num == 0 else f"{base_url}&page={page_num * 50}"
+                try:
+                    page_results = self._search_page(page_url)
+                except BackendError as e:
+                    if page_num == 0:
+                        raise
+                    log.warning("Stopping pagination, keeping %d results: %s", len(all_results), e)
+                    break
+                all_results.extend(page_results)
+                if is_last_page(page_results, query):
+                    break
+            return all_results
+
+    def latest(self, category: int, sub_category: int) -> list[dict]:
+        with self._locked():
+            self.login()
+            return self._search_page(f"{YGG_BASE_URL}/engine/search?name=&do=search&category={category}"
+                                     f"&sub_category={sub_category}&order=desc&sort=publish_date")
+
+    def download(self, torrent_page_url: str) -> tuple[bytes | None, str | None]:
+        with self._locked():
+            self.login()
+            match = re.search(r"/(\d+)-", torrent_page_url)
+            if not match:
+                return None, None
+            torrent_id = match.group(1)
+            reason = blocked_reason(self._get(torrent_page_url).text)
+            if reason:
+                raise BackendError(f"Torrent page unusable ({reason}): {torrent_page_url}")
+
+            resp = self._session.post(f"{YGG_BASE_URL}/engine/start_download_timer",
+                                      data={"torrent_id": torrent_id}, timeout=30)
+            if resp.status_code == 403:
+                self.logged_in = False
+                raise BackendError(f"Download timer refused for {torrent_id}: session lost")
+            if resp.status_code != 200:
+                log.error("Download timer refused for %s: %d", torrent_id, resp.status_code)
+                return None, None
+            timer = resp.json()
+            with timed("download_timer"):
+                time.sleep(timer.get("wait", 0))
+
+            with timed("download_file_wait"):
+                resp = self._get(f"{YGG_BASE_URL}/engine/download_torrent",
+                                 params={"id": torrent_id, "token": timer["token"]})
+            if any(m.encode() in resp.content[:2000] for m in CF_MARKERS):
+                raise BackendError(f"Download of {torrent_id} blocked by Cloudflare")
+            if resp.status_code != 200:
+                log.error("Download of %s failed: %d", torrent_id, resp.status_code)
+                return None, None
+            match = re.search(r'filename="(.+?)"', resp.headers.get("Content-Disposition", ""))
+            filename = match.group(1) if match else f"{torrent_id}.torrent"
+            log.info("Downloaded %s (%d bytes)", filename, len(resp.content))
+            return resp.content, filename
@@ -0,0 +1,77 @@
+"""Run a local sharded cluster: fake YGG, fake cache, N nodes (one fake account each) and the front end.
+
+    python -m loadtest.cluster --nodes 3
+    python -m loadtest.loadgen --target http://127.0.0.1:7475
+
+Stop a node process (see the printed PIDs) to watch the front end fail over.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _start(args: list[str], env: dict, name: str) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, *args], cwd=ROOT, env={**os.environ, **env})
+    print(f"{name:<10} pid {proc.pid}", flush=True)
+    return proc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest.cluster", description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--base-port", type=int, default=7480, help="first node port")
+    parser.add_argument("--frontend-port", type=int, default=7475)
+    parser.add_argument("--ygg-port", type=int, default=8081)
+    parser.add_argument("--cache-port", type=int, default=8082)
+    parser.add_argument("--countdown", type=float, default=3)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    procs = [
+        _start(["-m", "loadtest.fake_ygg", "--port", str(args.ygg_port), "--countdown", str(args.countdown),
+                "--latency", str(args.latency)], {}, "fake_ygg"),
+        _start(["-m", "loadtest.fake_cache", "--port", str(args.cache_port)], {}, "fake_cache"),
+    ]
+    time.sleep(1)
+
+    node_urls = []
+    for i in range(args.nodes):
+        port = args.base_port + i
+        node_urls.append(f"http://127.0.0.1:{port}")
+        procs.append(_start(["main.py"], {
+            "BACKEND": "http",
+            "PORT": str(port),
+            "WORKERS": "1",
+            "BROKER_SOCKET": "",
+            "YGG_BASE_URL": f"http://127.0.0.1:{args.ygg_port}",
+            "CACHE_API_URL": f"http://127.0.0.1:{args.cache_port}",
+            "YGG_USERNAME": f"node{i + 1}",
+            "YGG_PASSWORD": "test",
+            "DATA_DIR": f"data/node{i + 1}",
+        }, f"node{i + 1}"))
+
+    procs.append(_start(["frontend.py"], {
+        "NODES": ",".join(node_urls),
+        "FRONTEND_PORT": str(args.frontend_port),
+    }, "frontend"))
+    print(f"Front end on http://127.0.0.1:{args.frontend_port} — Ctrl+C to stop", flush=True)
+
+    try:
+        while all(p.poll() is None for p in procs[:2]):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Local stand-in for the torrent cache API (GET /health, GET/PUT /cache/<key>).
+
+    python -m loadtest.fake_cache --port 8082 --latency 0.05
+
+Point a node at it with CACHE_API_URL=http://127.0.0.1:8082.
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(latency: float):
+    store: dict[str, tuple[bytes, str | None]] = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: bytes = b"", headers=None):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(latency)
+            if self.path == "/health":
+                self._send(200, b"ok")
+                return
+            if not self.path.startswith("/cache/"):
+                self._send(404)
+                return
+            with lock:
+                entry = store.get(self.path[len("/cache/"):])
+            if entry is None:
+                self._send(404)
+                return
+            data, filename = entry
+            headers = {"Content-Type": "application/octet-stream"}
+            if filename:
+                headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+            self._send(200, data, headers)
+
+        def do_PUT(self):
+            time.sleep(latency)
+            if not self.path.startswith("/cache/"):
+                self._send(404)
+                return
+            data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                store[self.path[len("/cache/"):]] = (data, self.headers.get("X-Filename"))
+            self._send(200, b"stored")
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest.fake_cache", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every response")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.latency))
+    print(f"Fake cache listening on http://{args.host}:{args.port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Local stand-in for YGG: login, search pages, Cloudflare-like interstitials and the download countdown.
+
+    python -m loadtest.fake_ygg --port 8081 --latency 0.2 --countdown 3 --cf-rate 0.05
+
+Point a node at it with YGG_BASE_URL=http://127.0.0.1:8081 (BACKEND=http, or the browser backend).
+"""
+import argparse
+import hashlib
+import html
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import search_page_html, torrent_file
+from matching import parse_episodes, parse_seasons
+
+CF_PAGE = """<!DOCTYPE html><html><head><title>Just a moment...</title></head>
+<body><div class="cf-challenge">Checking your browser before accessing the site.</div>
+<script>setTimeout(function () {{ document.cookie = "cf_clearance={token}; path=/"; location.reload(); }}, 1500);</script>
+</body></html>"""
+
+LOGIN_PAGE = """<!DOCTYPE html><html><head><title>Connexion</title></head><body>
+<form action="/auth/process_login" method="post">
+<input name="id" type="text"><input name="pass" type="password"><button type="submit">Connexion</button>
+</form></body></html>"""
+
+HOME_PAGE = """<!DOCTYPE html><html><head><title>YggTorrent</title></head><body>
+<nav><ul>{account}</ul></nav><h1>Accueil</h1></body></html>"""
+
+ACCOUNT_PAGE = """<!DOCTYPE html><html><head><title>Mon compte</title></head><body>
+<nav><ul><li><a href="/user/account">Mon compte</a></li></ul></nav>
+<span id="profile_passkey">{passkey}</span></body></html>"""
+
+TORRENT_PAGE = """<!DOCTYPE html><html><head><title>Torrent {torrent_id}</title></head><body>
+<nav><ul><li><a href="/user/account">Mon compte</a></li></ul></nav>
+<button id="download-timer-btn">Télécharger</button>
+<span id="downloadTimerCountdown"></span>
+<a id="downloadTimerLink" href="#" style="display: none">Cliquer ici pour télécharger</a>
+<script>
+document.getElementById("download-timer-btn").addEventListener("click", function () {{
+  fetch("/engine/start_download_timer", {{method: "POST", body: new URLSearchParams({{torrent_id: "{torrent_id}"}})}})
+    .then(function (r) {{ return r.json(); }})
+    .then(function (t) {{
+      setTimeout(function () {{
+        var a = document.getElementById("downloadTimerLink");
+        a.href = "/engine/download_torrent?id={torrent_id}&token=" + t.token;
+        a.style.display = "";
+        a.className = "ready";
+      }}, t.wait * 1000);
+    }});
+}});
+</script></body></html>"""
+
+
+def _passkey(username: str) -> str:
+    return hashlib.sha1(f"fake-ygg:{username}".encode()).hexdigest()[:32]
+
+
+def _seed(*parts) -> int:
+    return int(hashlib.md5("|".join(map(str, parts)).encode()).hexdigest(), 16)
+
+
+class FakeYGG:
+    def __init__(self, latency: float, jitter: float, countdown: float, cf_rate: float, max_results: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.countdown = countdown
+        self.cf_rate = cf_rate
+        self.max_results = max_results
+        self.sessions: dict[str, str] = {}     # session id → username
+        self.timers: dict[str, tuple[str, float]] = {}  # token → (torrent id, ready at)
+        self.lock = threading.Lock()
+
+    def result_count(self, query: str) -> int:
+        # Deterministic per query, with some queries genuinely returning nothing
+        digest = _seed(query.lower())
+        return 0 if digest % 10 == 0 else digest % (self.max_results + 1)
+
+
+def make_handler(state: FakeYGG):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _cookies(self) -> dict[str, str]:
+            cookie = SimpleCookie(self.headers.get("Cookie", ""))
+            return {k: v.value for k, v in cookie.items()}
+
+        def _send(self, status: int, body: bytes | str, content_type="text/html; charset=utf-8", headers=None):
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _user(self) -> str | None:
+            return state.sessions.get(self._cookies().get("ygg_", ""))
+
+        def _delay(self):
+            if state.latency or state.jitter:
+                time.sleep(state.latency + random.uniform(0, state.jitter))
+
+        def _challenge(self) -> bool:
+            if "cf_clearance" in self._cookies() and random.random() >= state.cf_rate:
+                return False
+            token = secrets.token_hex(8)
+            self._send(403, CF_PAGE.format(token=token), headers={"Set-Cookie": f"cf_clearance={token}; Path=/"})
+            return True
+
+        def do_GET(self):
+            self._delay()
+            if self._challenge():
+                return
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            user = self._user()
+            account = ('<li><a href="/user/account">Mon compte</a></li>' if user
+                       else '<li><a href="/auth/login">Connexion</a></li>')
+
+            if url.path in ("", "/"):
+                self._send(200, HOME_PAGE.format(account=account))
+            elif url.path == "/auth/login":
+                self._send(200, LOGIN_PAGE)
+            elif url.path == "/user/account":
+                if not user:
+                    self._send(302, "", headers={"Location": "/auth/login"})
+                else:
+                    self._send(200, ACCOUNT_PAGE.format(passkey=_passkey(user)))
+            elif url.path == "/engine/search":
+                self._search(params, bool(user))
+            elif url.path.startswith("/torrent/"):
+                match = re.search(r"/(\d+)-", url.path)
+                self._send(200 if match else 404, TORRENT_PAGE.format(torrent_id=match.group(1) if match else ""))
+            elif url.path == "/engine/download_torrent":
+                self._download(params, user)
+            else:
+                self._send(404, "Not found")
+
+        def do_POST(self):
+            self._delay()
+            length = int(self.headers.get("Content-Length", 0))
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+            path = urlparse(self.path).path
+
+            if path == "/auth/process_login":
+                if not form.get("id"):
+                    self._send(400, "Missing id")
+                    return
+                sid = secrets.token_hex(16)
+                with state.lock:
+                    state.sessions[sid] = form["id"]
+                self._send(302, "", headers={"Location": "/", "Set-Cookie": f"ygg_={sid}; Path=/"})
+            elif path == "/engine/start_download_timer":
+                if not self._user():
+                    self._send(403, json.dumps({"error": "not logged in"}), "application/json")
+                    return
+                token = secrets.token_hex(16)
+                with state.lock:
+                    state.timers[token] = (form.get("torrent_id", ""), time.monotonic() + state.countdown)
+                self._send(200, json.dumps({"token": token, "wait": state.countdown}), "application/json")
+            else:
+                self._send(404, "Not found")
+
+        def _search(self, params: dict, logged_in: bool):
+            query = params.get("name", "")
+            offset = int(params.get("page", 0) or 0)
+            total = state.result_count(query) if query else state.max_results
+            rows = max(0, min(50, total - offset))
+            episodes = parse_episodes(query)
+            seasons = parse_seasons(query)
+            season = episodes[0][0] if episodes else min(seasons) if seasons else None
+            episode = episodes[0][1] if episodes else None
+            show = re.sub(r"(?i)\bS\d{1,2}(E\d{1,3})?\b", "", query).strip().title() or None
+            seed = _seed(query, params.get("sub_category"), params.get("sort"), offset)
+            # &sort=seed: seeder counts decrease across the whole result set, down to dead torrents
+            seeders = ([int(3000 * 0.9 ** i) for i in range(offset, offset + rows)]
+                       if params.get("sort") == "seed" else None)
+            self._send(200, search_page_html(rows, seed=seed, show=show, season=season, episode=episode,
+                                             base_url=f"http://{self.headers.get('Host')}", logged_in=logged_in,
+                                             seeders=seeders))
+
+        def _download(self, params: dict, user: str | None):
+            with state.lock:
+                torrent_id, ready_at = state.timers.pop(params.get("token", ""), ("", 0))
+            if not user or torrent_id != params.get("id") or time.monotonic() < ready_at:
+                self._send(403, "Timer not finished")
+                return
+            num_files = 1 + int(torrent_id) % 40
+            data = torrent_file(num_files, seed=int(torrent_id), passkey=_passkey(user))
+            self._send(200, data, "application/x-bittorrent",
+                       headers={"Content-Disposition": f'attachment; filename="{html.escape(torrent_id)}.torrent"'})
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest.fake_ygg", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="extra random latency, up to this many seconds")
+    parser.add_argument("--countdown", type=float, default=3, help="download timer in seconds (YGG: ~30)")
+    parser.add_argument("--cf-rate", type=float, default=0.02, help="probability of a CF interstitial per request")
+    parser.add_argument("--max-results", type=int, default=120, help="max results per query")
+    args = parser.parse_args(argv)
+
+    state = FakeYGG(args.latency, args.jitter, args.countdown, args.cf_rate, args.max_results)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"Fake YGG listening on http://{args.host}:{args.port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Replay Prowlarr/Sonarr/Radarr-shaped traffic against a node and report latency per endpoint.
+
+    python -m loadtest.loadgen --target http://127.0.0.1:7474 --apikey changeme --concurrency 8 --duration 60
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SHOWS = ["The Last of Us", "Les Revenants", "Dark", "Lupin", "Baron Noir", "Kaamelott", "Engrenages"]
+MOVIES = ["Dune", "Oppenheimer", "La Haine", "Intouchables", "Le Dîner de cons"]
+
+# (endpoint, weight): roughly what an *arr stack sends between RSS syncs and backlog searches
+MIX = [("caps", 2), ("rss", 20), ("search", 8), ("tvsearch", 35), ("movie", 10), ("download", 25)]
+
+_ENCLOSURE_RE = re.compile(r'<enclosure url="([^"]+)"')
+
+
+class LoadGenerator:
+    def __init__(self, target: str, apikey: str, seed: int):
+        self.target = target.rstrip("/")
+        self.apikey = apikey
+        self.rng = random.Random(seed)
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.download_urls: list[str] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _request(self, endpoint: str) -> tuple[str, str, dict]:
+        with self._lock:
+            rng = random.Random(self.rng.random())
+            download_urls = list(self.download_urls[-200:])
+
+        if endpoint == "download" and download_urls:
+            return "download", rng.choice(download_urls), {}
+        api = f"{self.target}/api"
+        if endpoint in ("download", "search"):
+            return "search", api, {"t": "search", "q": rng.choice(SHOWS + MOVIES)}
+        if endpoint == "caps":
+            return "caps", api, {"t": "caps"}
+        if endpoint == "rss":
+            return "rss", api, {"t": "tvsearch", "cat": "5000,5040"}
+        if endpoint == "tvsearch":
+            # Backlog searches: many episodes of the same few seasons
+            return "tvsearch", api, {"t": "tvsearch", "q": rng.choice(SHOWS), "cat": "5000",
+                                     "season": str(rng.randint(1, 3)), "ep": str(rng.randint(1, 10))}
+        return "movie", api, {"t": "movie", "q": rng.choice(MOVIES), "cat": "2000"}
+
+    def run_one(self, endpoint: str):
+        label, url, params = self._request(endpoint)
+        if params:
+            params["apikey"] = self.apikey
+        start = time.perf_counter()
+        try:
+            resp = self._session().get(url, params=params, timeout=300)
+            ok = resp.status_code == 200
+        except requests.RequestException:
+            resp, ok = None, False
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.latencies[label].append(elapsed)
+            if not ok:
+                self.errors[label] += 1
+            elif label != "download":
+                urls = [u.replace("&amp;", "&") for u in _ENCLOSURE_RE.findall(resp.text) if "/download?" in u and "/torrent/" in u]
+                self.download_urls.extend(urls[:5])
+
+    def pick(self) -> str:
+        endpoints, weights = zip(*MIX)
+        with self._lock:
+            return self.rng.choices(endpoints, weights)[0]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(gen: LoadGenerator, wall: float) -> dict:
+    summary = {}
+    for label, values in sorted(gen.latencies.items()):
+        summary[label] = {
+            "requests": len(values),
+            "errors": gen.errors.get(label, 0),
+            "throughput_rps": len(values) / wall,
+            "p50_s": _percentile(values, 50),
+            "p95_s": _percentile(values, 95),
+            "p99_s": _percentile(values, 99),
+            "mean_s": statistics.fmean(values),
+        }
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest.loadgen", description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="http://127.0.0.1:7474")
+    parser.add_argument("--apikey", default="changeme")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many requests instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    gen = LoadGenerator(args.target, args.apikey, args.seed)
+    deadline = time.monotonic() + args.duration
+    issued = 0
+    issued_lock = threading.Lock()
+
+    def worker():
+        nonlocal issued
+        while True:
+            with issued_lock:
+                if (args.requests and issued >= args.requests) or (not args.requests and time.monotonic() >= deadline):
+                    return
+                issued += 1
+            gen.run_one(gen.pick())
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - start
+
+    summary = report(gen, wall)
+    print(f"{'endpoint':<18} {'reqs':>6} {'errs':>5} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, s in summary.items():
+        print(f"{label:<18} {s['requests']:>6} {s['errors']:>5} {s['throughput_rps']:>7.2f} "
+              f"{s['p50_s']:>7.3f}s {s['p95_s']:>7.3f}s {s['p99_s']:>7.3f}s")
+    total = sum(s["requests"] for s in summary.values())
+    print(f"{total} requests in {wall:.1f}s ({total / wall:.2f} req/s, concurrency {args.concurrency})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"wall_s": wall, "concurrency": args.concurrency, "endpoints": summary}, f, indent=2)
+    errors = sum(s["errors"] for s in summary.values())
+    return 0 if total > errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
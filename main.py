@@ -1,4 +1,6 @@
 import logging
+import threading
+import time
 from contextlib import asynccontextmanager
 from urllib.parse import quote
 from unicodedata import normalize
@@ -6,14 +8,17 @@ from unicodedata import normalize
 from fastapi import FastAPI, Query, Request, Response
 from fastapi.responses import PlainTextResponse
 
-from config import API_KEY, DEBUG
-from browser import browser
+from config import API_KEY, DEBUG, SEASON_SEARCH, BROKER_SOCKET, WORKERS, PORT
+from backend import UNAVAILABLE_HEADER, BackendError, get_backend, get_broker_client, get_jobs
+from metrics import Gauge, events, render as render_metrics, request_seconds
 from resolver import resolve_query
+from search import search
 from torznab import caps_xml, search_xml, torznab_cats_to_ygg
 from torrent_cache import (
     is_cache_available, get_from_cache, put_to_cache,
     make_cache_key, inject_passkey, strip_passkey, filename_from_url,
 )
+from warmer import warmer
 
 def _safe_filename(name: str) -> str:
     name = normalize("NFKC", name)
@@ -23,6 +28,15 @@ def _safe_filename(name: str) -> str:
 logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 log = logging.getLogger(__name__)
 
+BACKEND_RETRY_AFTER = 60
+
+backend = get_backend()
+# Local objects, or proxies to the broker's when BROKER_SOCKET is set (one season cache for every worker)
+jobs = get_jobs()
+
+Gauge("yggtzn_logged_in", "1 if the YGG session is logged in.", lambda: backend.logged_in)
+Gauge("yggtzn_backend_busy", "1 if a search or download holds the backend.", lambda: backend.busy)
+
 DUMMY_RESULTS = [
     {
         "title": "YGGTorznab Test Movie",
@@ -45,21 +59,127 @@ DUMMY_RESULTS = [
 ]
 
 
+def _int_param(value: str, default: int) -> int:
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return default
+
+
+def _unavailable(e: BackendError) -> Response:
+    log.warning("YGG unavailable: %s", e)
+    events.inc("backend_error")
+    return PlainTextResponse("YGG unavailable, retry later", status_code=503,
+                             headers={"Retry-After": str(BACKEND_RETRY_AFTER), UNAVAILABLE_HEADER: "1"})
+
+
+def _prefetch(results: list[dict], query: str):
+    # Prefetching is best effort: never lose search results over it
+    try:
+        jobs.prefetcher.submit(results, query)
+    except BackendError as e:
+        log.warning("Prefetch submit failed: %s", e)
+
+
+def _download(url: str) -> tuple[bytes | None, str | None]:
+    """backend.download, skipped while the URL is backing off after a failed download."""
+    key = make_cache_key(url)
+    if jobs.failed_downloads.retry_after(key):
+        log.info("Download of %s failed recently, not retrying yet", url)
+        events.inc("negative_download_hit")
+        return None, None
+    torrent_data, filename = backend.download(url)
+    if torrent_data:
+        jobs.failed_downloads.clear(key)
+    else:
+        jobs.failed_downloads.record(key)
+    return torrent_data, filename
+
+
+def _download_failed(url: str) -> Response:
+    retry_after = jobs.failed_downloads.retry_after(make_cache_key(url))
+    return PlainTextResponse("Download failed", status_code=503,
+                             headers={"Retry-After": str(retry_after)} if retry_after else None)
+
+
+def _warm_up():
+    if not BROKER_SOCKET:
+        log.info("Logging in to YGG…")
+        try:
+            backend.ensure_logged_in()
+        except Exception as e:
+            log.error("Initial login failed: %s — will retry on first request", e)
+        jobs.rss_feed.start()
+        jobs.prefetcher.start()
+        warmer.start()
+    # Derive the cache encryption key now rather than on the first download
+    from crypto import _aesgcm
+    _aesgcm()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    log.info("Logging in to YGG…")
-    try:
-        browser.login()
-    except Exception as e:
-        log.error("Initial login failed: %s — will retry on first request", e)
+    if BROKER_SOCKET:
+        log.info("Using browser broker at %s", BROKER_SOCKET)
+    # Serve requests (caps, health) right away; login runs in the background
+    threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
     yield
-    log.info("Shutting down browser…")
-    browser.close()
+    if BROKER_SOCKET:
+        return
+    warmer.stop()
+    jobs.prefetcher.stop()
+    jobs.rss_feed.stop()
+    log.info("Shutting down backend…")
+    backend.close()
 
 
 app = FastAPI(title="YGGTorznab", lifespan=lifespan)
 
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    endpoint = route.path if route else "unmatched"
+    if endpoint == "/api":
+        t = request.query_params.get("t", "")
+        endpoint = f"/api:{t if t in ('caps', 'search', 'tvsearch', 'movie') else 'other'}"
+    request_seconds.observe(endpoint, time.perf_counter() - start)
+    return response
+
+
+@app.get("/health")
+def health():
+    return PlainTextResponse("OK")
+
+
+@app.get("/ready")
+def ready():
+    try:
+        if backend.logged_in:
+            return PlainTextResponse("Ready")
+    except BackendError as e:
+        return _unavailable(e)
+    return PlainTextResponse("Logging in", status_code=503)
+
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/broker")
+def broker_metrics():
+    if not BROKER_SOCKET:
+        return PlainTextResponse("No broker in use", status_code=404)
+    try:
+        text = get_broker_client().call("metrics", "render")
+    except BackendError as e:
+        return _unavailable(e)
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api")
 def torznab_api(
     request: Request,
@@ -86,11 +206,43 @@ def torznab_api(
         media = "tv" if t == "tvsearch" else "movie"
         log.debug("Search request: t=%s, q=%r, imdbid=%r, tmdbid=%r, tvdbid=%r, cat=%r",
                   t, q, imdbid, tmdbid, tvdbid, cat)
+
+        if SEASON_SEARCH and t == "tvsearch" and season.isdigit() and ep.isdigit():
+            title = resolve_query(q=q, imdbid=imdbid, tmdbid=tmdbid, tvdbid=tvdbid, media=media)
+            if title:
+                try:
+                    results = jobs.search_episode(title, int(season), int(ep), cat)
+                except BackendError as e:
+                    return _unavailable(e)
+                _prefetch(results, f"{title} S{int(season):02d}E{int(ep):02d}")
+                download_base = str(request.base_url).rstrip("/")
+                return Response(
+                    content=search_xml(results, download_base=download_base, apikey=apikey),
+                    media_type="application/xml",
+                )
+
         search_q = resolve_query(
             q=q, imdbid=imdbid, tmdbid=tmdbid, tvdbid=tvdbid,
             media=media, season=season, ep=ep,
         )
 
+        try:
+            rss_available = not search_q and not (q or imdbid or tmdbid or tvdbid) and len(jobs.rss_feed)
+        except BackendError as e:
+            return _unavailable(e)
+        if rss_available:
+            subcats = {str(sub) for _, sub in torznab_cats_to_ygg(cat)}
+            try:
+                results = jobs.rss_feed.items(subcats, offset=_int_param(offset, 0), limit=min(_int_param(limit, 100), 100))
+            except BackendError as e:
+                return _unavailable(e)
+            log.debug("Empty query, serving %d results from the RSS index", len(results))
+            download_base = str(request.base_url).rstrip("/")
+            return Response(
+                content=search_xml(results, download_base=download_base, apikey=apikey),
+                media_type="application/xml",
+            )
+
         if not search_q:
             log.debug("No search query resolved, returning dummy results")
             download_base = str(request.base_url).rstrip("/")
@@ -100,19 +252,11 @@ def torznab_api(
             )
 
         log.debug("Resolved search query: %r", search_q)
-        ygg_cats = torznab_cats_to_ygg(cat)
-        log.debug("YGG categories: %s", ygg_cats)
-
-        if ygg_cats:
-            results = []
-            seen = set()
-            for ygg_cat, ygg_subcat in ygg_cats:
-                for r in browser.search(search_q, category=ygg_cat, sub_category=ygg_subcat):
-                    if r["link"] not in seen:
-                        seen.add(r["link"])
-                        results.append(r)
-        else:
-            results = browser.search(search_q)
+        try:
+            results = search(search_q, cat)
+        except BackendError as e:
+            return _unavailable(e)
+        _prefetch(results, search_q)
 
         log.debug("Search returned %d results", len(results))
         download_base = str(request.base_url).rstrip("/")
@@ -138,14 +282,20 @@ def download_torrent(
     url = quote(url, safe=':/?#[]@!$&\'()*+,;=-._~%')
 
     try:
-        if browser.passkey and is_cache_available():
+        jobs.prefetcher.wait_for(url)
+    except BackendError as e:
+        return _unavailable(e)
+
+    try:
+        if backend.passkey and is_cache_available():
             cache_key = make_cache_key(url)
             cached = get_from_cache(cache_key)
 
             if cached is not None:
                 cached_data, cached_filename = cached
                 log.info("Cache HIT for %s", url)
-                torrent_data = inject_passkey(cached_data, browser.passkey)
+                events.inc("torrent_cache_hit")
+                torrent_data = inject_passkey(cached_data, backend.passkey)
                 fname = _safe_filename(cached_filename or filename_from_url(url))
                 return Response(
                     content=torrent_data,
@@ -154,9 +304,10 @@ def download_torrent(
                 )
 
             log.info("Cache MISS for %s", url)
-            torrent_data, filename = browser.download(url)
+            events.inc("torrent_cache_miss")
+            torrent_data, filename = _download(url)
             if not torrent_data:
-                return PlainTextResponse("Download failed", status_code=500)
+                return _download_failed(url)
 
             try:
                 stripped = strip_passkey(torrent_data)
@@ -170,12 +321,17 @@ def download_torrent(
                 media_type="application/x-bittorrent",
                 headers={"Content-Disposition": f'attachment; filename="{_safe_filename(filename)}"'},
             )
+    except BackendError as e:
+        return _unavailable(e)
     except Exception as e:
         log.warning("Cache logic error, falling back to direct download: %s", e)
 
-    torrent_data, filename = browser.download(url)
+    try:
+        torrent_data, filename = _download(url)
+    except BackendError as e:
+        return _unavailable(e)
     if not torrent_data:
-        return PlainTextResponse("Download failed", status_code=500)
+        return _download_failed(url)
 
     return Response(
         content=torrent_data,
@@ -186,4 +342,13 @@ def download_torrent(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=7474)
+    if WORKERS > 1:
+        from broker import spawn
+        broker_process = spawn()
+        try:
+            uvicorn.run("main:app", host="0.0.0.0", port=PORT, workers=WORKERS)
+        finally:
+            broker_process.terminate()
+            broker_process.wait(timeout=30)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=PORT)
@@ -0,0 +1,79 @@
+import re
+import unicodedata
+
+# Release-name markers. Lookarounds instead of \b so that "_" and "." both act as separators.
+# S01E01, S01E01-E03, S01E01-03 and chained S01E01E02E03: the chain is captured whole, its last number ends the range
+_EPISODE_RE = re.compile(
+    r"(?<![a-z0-9])S(\d{1,2})[ ._-]?E(\d{1,3})((?:[ ._-]?E\d{1,3}(?![0-9])|-\d{1,3}(?![a-z0-9]))*)(?![0-9])", re.I,
+)
+# S01-S05, S01-05, S01 à S05, S01.to.S05
+_SEASON_RANGE_RE = re.compile(
+    r"(?<![a-z0-9])S(\d{1,2})(?:[ ._]?-[ ._]?S?|[ ._](?:à|a|to)[ ._]S)(\d{1,2})(?![a-z0-9])", re.I,
+)
+_SEASON_RE = re.compile(r"(?<![a-z0-9])S(\d{1,2})(?![a-z0-9])", re.I)
+_SAISON_RE = re.compile(
+    r"(?<![a-z0-9])(?:Saison|Season)[ ._-]?(\d{1,2})(?:[ ._-]?(?:à|a|-|to)[ ._-]?(\d{1,2}))?(?![0-9])", re.I,
+)
+_TOKEN_RE = re.compile(r"\w+")
+_NUMBER_RE = re.compile(r"\d+")
+# "s.h.i.e.l.d." / "S.H.I.E.L.D" — single letters joined by dots
+_ACRONYM_RE = re.compile(r"(?<![a-z0-9])(?:[a-z]\.){2,}(?:[a-z](?![a-z0-9]))?")
+
+
+def parse_episodes(title: str) -> list[tuple[int, int, int]]:
+    """Return (season, first_episode, last_episode) for every episode marker in a release name."""
+    markers = []
+    for m in _EPISODE_RE.finditer(title):
+        season, first = int(m.group(1)), int(m.group(2))
+        chain = _NUMBER_RE.findall(m.group(3))
+        last = int(chain[-1]) if chain else first
+        markers.append((season, first, max(first, last)))
+    return markers
+
+
+def parse_seasons(title: str) -> set[int]:
+    """Return the seasons covered by season-pack markers (S01, S01-S03, Saison 1…)."""
+    seasons = set()
+    for m in _SEASON_RANGE_RE.finditer(title):
+        first, last = int(m.group(1)), int(m.group(2))
+        seasons.update(range(first, max(first, last) + 1))
+    for m in _SAISON_RE.finditer(title):
+        first = int(m.group(1))
+        last = int(m.group(2)) if m.group(2) else first
+        seasons.update(range(first, max(first, last) + 1))
+    for m in _SEASON_RE.finditer(title):
+        seasons.add(int(m.group(1)))
+    return seasons
+
+
+def matches_episode(title: str, season: int, ep: int) -> bool:
+    episodes = parse_episodes(title)
+    if episodes:
+        return any(s == season and first <= ep <= last for s, first, last in episodes)
+    return season in parse_seasons(title)
+
+
+def words(text: str) -> list[str]:
+    """Lowercase, accent-free words of a title or query, with apostrophes dropped and dotted acronyms joined."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c) and c not in "'’")
+    text = _ACRONYM_RE.sub(lambda m: m.group().replace(".", "") + " ", text)
+    return _TOKEN_RE.findall(text)
+
+
+def matches_query(title: str, query: str) -> bool:
+    """True if a release name contains every word of the query and its season/episode, if any."""
+    title_tokens = set(words(title))
+    episodes = parse_episodes(query)
+    seasons = parse_seasons(query)
+
+    query_words = words(_SEASON_RE.sub(" ", _EPISODE_RE.sub(" ", query)))
+    if not all(w in title_tokens for w in query_words):
+        return False
+    if episodes:
+        season, ep, _ = episodes[0]
+        return matches_episode(title, season, ep)
+    if seasons:
+        return any(s in parse_seasons(title) or any(s == es for es, _, _ in parse_episodes(title))
+                   for s in seasons)
+    return True
@@ -0,0 +1,95 @@
+import threading
+import time
+from contextlib import contextmanager
+
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+
+_registry = {}  # name → metric; re-registering a name (module imported twice) replaces it
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label: str):
+        self.name, self.help, self.label = name, help_text, label
+        self._values: dict[str, float] = {}
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def inc(self, label_value: str, amount: float = 1):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for value, total in sorted(self._values.items()):
+                lines.append(f'{self.name}{{{self.label}="{value}"}} {_fmt(total)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label: str, buckets: tuple = _BUCKETS):
+        self.name, self.help, self.label, self.buckets = name, help_text, label, buckets
+        self._series: dict[str, list] = {}  # label value → [bucket counts, sum, count]
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def observe(self, label_value: str, seconds: float):
+        with self._lock:
+            series = self._series.setdefault(label_value, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[0][i] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for value, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{self.label}="{value}",le="{_fmt(bound)}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{self.label}="{value}",le="+Inf"}} {count}')
+                lines.append(f'{self.name}_sum{{{self.label}="{value}"}} {total:.6f}')
+                lines.append(f'{self.name}_count{{{self.label}="{value}"}} {count}')
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time."""
+
+    def __init__(self, name: str, help_text: str, func):
+        self.name, self.help, self.func = name, help_text, func
+        _registry[name] = self
+
+    def render(self) -> list[str]:
+        try:
+            value = float(self.func())
+        except Exception:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {_fmt(value)}"]
+
+
+stage_seconds = Histogram("yggtzn_stage_seconds", "Time spent in each processing stage.", "stage")
+request_seconds = Histogram("yggtzn_request_seconds", "HTTP request latency by endpoint.", "endpoint")
+events = Counter("yggtzn_events_total", "Cache hits/misses and other notable events.", "event")
+
+
+@contextmanager
+def timed(stage: str):
+    """Record the duration of a block (or, used as a decorator, of each call) under a stage label."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(stage, time.perf_counter() - start)
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,60 @@
+import logging
+import threading
+import time
+
+from config import NEGATIVE_CACHE_TTL, NEGATIVE_CACHE_MAX_TTL
+from metrics import Gauge
+
+log = logging.getLogger(__name__)
+
+
+class NegativeCache:
+    """Remembers work that came back empty and backs off exponentially while it keeps doing so.
+
+    The n-th consecutive failure blocks the key for ttl * 2**(n-1) seconds, capped at max_ttl. A key that
+    stays quiet for max_ttl after its block expired starts over from ttl.
+    """
+
+    def __init__(self, name: str, ttl: int, max_ttl: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_ttl = max(ttl, max_ttl)
+        self._entries: dict = {}  # key → (consecutive failures, blocked until)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def retry_after(self, key) -> int:
+        """Seconds until key may be tried again, 0 if it is not blocked."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return 0
+        return max(0, round(entry[1] - time.monotonic()))
+
+    def record(self, key):
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            failures, until = self._entries.get(key, (0, 0))
+            if now - until > self.max_ttl:
+                failures = 0
+            failures += 1
+            backoff = min(self.ttl * 2 ** (failures - 1), self.max_ttl)
+            self._entries[key] = (failures, now + backoff)
+            for k in [k for k, (_, t) in self._entries.items() if now - t > self.max_ttl]:
+                del self._entries[k]
+        log.info("Negative cache [%s]: %r blocked for %ds (failure #%d)", self.name, key, backoff, failures)
+
+    def clear(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+empty_searches = NegativeCache("search", NEGATIVE_CACHE_TTL, NEGATIVE_CACHE_MAX_TTL)
+failed_downloads = NegativeCache("download", NEGATIVE_CACHE_TTL, NEGATIVE_CACHE_MAX_TTL)
+
+Gauge("yggtzn_negative_searches", "Queries remembered as returning no results.", lambda: len(empty_searches))
+Gauge("yggtzn_negative_downloads", "Torrent URLs remembered as failing to download.", lambda: len(failed_downloads))
@@ -0,0 +1,123 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from backend import IDLE_POLL_SECONDS, get_backend, wait_until_idle
+from config import PREFETCH_TOP_N, PREFETCH_BUDGET_PER_HOUR
+from matching import matches_query
+from metrics import events
+from negative_cache import failed_downloads
+from torrent_cache import is_cache_available, get_from_cache, put_to_cache, make_cache_key, strip_passkey
+
+log = logging.getLogger(__name__)
+
+
+def rank(results: list[dict], query: str) -> list[dict]:
+    """Order results by likelihood of being grabbed: exact title/season/episode match first, then seeders."""
+    candidates = [r for r in results if r.get("seeders", 0) > 0]
+    return sorted(candidates, key=lambda r: (matches_query(r["title"], query), r["seeders"]), reverse=True)
+
+
+class Prefetcher:
+    def __init__(self, top_n: int, budget_per_hour: int):
+        self.top_n = top_n
+        self.budget_per_hour = budget_per_hour
+        # LIFO: picks from the most recent search are the likeliest to be grabbed next
+        self._queue: queue.LifoQueue[str] = queue.LifoQueue(maxsize=max(top_n, 1) * 10)
+        self._queued: set[str] = set()
+        self._in_flight: dict[str, threading.Event] = {}
+        self._downloads: deque[float] = deque()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.top_n <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="prefetcher", daemon=True)
+        self._thread.start()
+        log.info("Prefetcher started (top %d per search, %d downloads/hour)", self.top_n, self.budget_per_hour)
+
+    def stop(self):
+        self._stop.set()
+
+    def submit(self, results: list[dict], query: str):
+        if self.top_n <= 0 or not self._thread:
+            return
+        for r in rank(results, query)[:self.top_n]:
+            key = make_cache_key(r["link"])
+            with self._lock:
+                if key in self._queued or key in self._in_flight:
+                    continue
+                try:
+                    self._queue.put_nowait(r["link"])
+                except queue.Full:
+                    return
+                self._queued.add(key)
+            log.debug("Queued prefetch of %s", r["link"])
+
+    def wait_for(self, url: str, timeout: float = 60) -> bool:
+        """Block until an in-flight prefetch of url completes. Returns True if there was one."""
+        event = self._in_flight.get(make_cache_key(url))
+        if not event:
+            return False
+        log.info("Waiting for in-flight prefetch of %s", url)
+        event.wait(timeout)
+        return True
+
+    def _within_budget(self) -> bool:
+        cutoff = time.monotonic() - 3600
+        while self._downloads and self._downloads[0] < cutoff:
+            self._downloads.popleft()
+        return len(self._downloads) < self.budget_per_hour
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                url = self._queue.get(timeout=IDLE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+            key = make_cache_key(url)
+            wait_until_idle(self._stop)
+
+            event = threading.Event()
+            with self._lock:
+                self._queued.discard(key)
+                self._in_flight[key] = event
+            try:
+                self._prefetch(url, key)
+            except Exception as e:
+                log.warning("Prefetch of %s failed: %s", url, e)
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+                event.set()
+
+    def _prefetch(self, url: str, key: str):
+        if not get_backend().passkey or not is_cache_available():
+            return
+        if get_from_cache(key) is not None:
+            log.debug("Prefetch skipped, already cached: %s", url)
+            return
+        if failed_downloads.retry_after(key):
+            log.debug("Prefetch skipped, download failed recently: %s", url)
+            return
+        if not self._within_budget():
+            log.info("Prefetch budget exhausted (%d/hour), skipping %s", self.budget_per_hour, url)
+            return
+
+        self._downloads.append(time.monotonic())
+        torrent_data, filename = get_backend().download(url)
+        if not torrent_data:
+            failed_downloads.record(key)
+            return
+        put_to_cache(key, strip_passkey(torrent_data), filename=filename)
+        log.info("Prefetched %s", url)
+        events.inc("prefetch_download")
+
+
+prefetcher = Prefetcher(PREFETCH_TOP_N, PREFETCH_BUDGET_PER_HOUR)
@@ -1,30 +1,82 @@
 import json
 import logging
+import sqlite3
+import time
 import urllib.request
-from config import TMDB_API_KEY
+from pathlib import Path
+
+from config import DATA_DIR, TMDB_API_KEY, TMDB_CACHE_TTL
+from metrics import events, timed
+from sqlite_store import SQLiteStore
 
 log = logging.getLogger(__name__)
 
 TMDB_BASE = "https://api.themoviedb.org/3"
+TMDB_CACHE_PATH = Path(__file__).parent / DATA_DIR / "tmdb.db"
+
+
+class TMDbCache(SQLiteStore):
+    """TMDb responses by path, in SQLite so every worker and restarts share what the warmer fetched."""
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS responses (path TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at INTEGER NOT NULL);
+    """
+
+    def __init__(self, path: Path, ttl: int):
+        super().__init__(path)
+        self.ttl = ttl
+
+    def get(self, path: str) -> dict | None:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            row = self._db().execute("SELECT data FROM responses WHERE path = ? AND fetched_at >= ?",
+                                     (path, int(time.time()) - self.ttl)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, path: str, data: dict):
+        if self.ttl <= 0:
+            return
+        now = int(time.time())
+        with self._lock, self._db() as db:
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (path, json.dumps(data), now))
+            db.execute("DELETE FROM responses WHERE fetched_at < ?", (now - self.ttl,))
+
+
+tmdb_cache = TMDbCache(TMDB_CACHE_PATH, TMDB_CACHE_TTL)
 
 
 def _tmdb_get(path: str) -> dict | None:
     if not TMDB_API_KEY:
         log.debug("TMDB_API_KEY is not set, skipping TMDb lookup")
         return None
+    try:
+        cached = tmdb_cache.get(path)
+    except sqlite3.Error as e:
+        log.warning("TMDb cache read failed: %s", e)
+        cached = None
+    if cached is not None:
+        log.debug("TMDb cache HIT for %s", path)
+        events.inc("tmdb_cache_hit")
+        return cached
     url = f"{TMDB_BASE}{path}"
     sep = "&" if "?" in path else "?"
     url += f"{sep}api_key={TMDB_API_KEY}&language=fr-FR"
     log.debug("TMDb GET %s", url.replace(TMDB_API_KEY, "***"))
     try:
         req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=10) as resp:
+        with timed("tmdb"), urllib.request.urlopen(req, timeout=10) as resp:
             data = json.loads(resp.read())
             log.debug("TMDb response keys: %s", list(data.keys()) if data else None)
-            return data
     except Exception as e:
         log.warning("TMDb request failed: %s", e)
         return None
+    if data:
+        try:
+            tmdb_cache.put(path, data)
+        except sqlite3.Error as e:
+            log.warning("TMDb cache write failed: %s", e)
+    return data
 
 
 def resolve_imdbid(imdbid: str) -> str | None:
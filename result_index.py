@@ -0,0 +1,139 @@
+import logging
+import re
+import time
+from pathlib import Path
+
+from config import DATA_DIR, MAX_SEARCH_PAGES, RESULT_INDEX_TTL
+from matching import matches_query, words
+from sqlite_store import SQLiteStore
+from torznab import ygg_cats_key
+
+log = logging.getLogger(__name__)
+
+INDEX_PATH = Path(__file__).parent / DATA_DIR / "results.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    link TEXT PRIMARY KEY,
+    torrent_id TEXT,
+    title TEXT NOT NULL,
+    size INTEGER,
+    seeders INTEGER,
+    leechers INTEGER,
+    subcat TEXT,
+    pub_date INTEGER,
+    seen_at INTEGER NOT NULL
+);
+-- Titles are indexed as matching.words() terms, so "Grey's" and "S.H.I.E.L.D." match like matches_query does
+DROP TRIGGER IF EXISTS results_ai;
+DROP TRIGGER IF EXISTS results_ad;
+DROP TRIGGER IF EXISTS results_au;
+DROP TABLE IF EXISTS results_fts;
+CREATE VIRTUAL TABLE IF NOT EXISTS results_terms USING fts5(terms, tokenize='unicode61');
+CREATE TRIGGER IF NOT EXISTS results_terms_ai AFTER INSERT ON results BEGIN
+    INSERT INTO results_terms(rowid, terms) VALUES (new.rowid, title_terms(new.title));
+END;
+CREATE TRIGGER IF NOT EXISTS results_terms_ad AFTER DELETE ON results BEGIN
+    DELETE FROM results_terms WHERE rowid = old.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS results_terms_au AFTER UPDATE OF title ON results BEGIN
+    UPDATE results_terms SET terms = title_terms(new.title) WHERE rowid = new.rowid;
+END;
+INSERT INTO results_terms(rowid, terms)
+    SELECT rowid, title_terms(title) FROM results WHERE rowid NOT IN (SELECT rowid FROM results_terms);
+CREATE TABLE IF NOT EXISTS coverage (
+    query TEXT NOT NULL,
+    cat TEXT NOT NULL,
+    searched_at INTEGER NOT NULL,
+    PRIMARY KEY (query, cat)
+);
+"""
+
+_COLUMNS = ("title", "link", "torrent_id", "size", "seeders", "leechers", "subcat", "pub_date")
+_MARKER_RE = re.compile(r"s\d{1,2}(e\d{1,3})?")
+
+
+def _terms(text: str) -> str:
+    return " ".join(words(text))
+
+
+class ResultIndex(SQLiteStore):
+    schema = _SCHEMA
+    functions = {"title_terms": _terms}
+
+    def __init__(self, path: Path, ttl: int):
+        super().__init__(path)
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def add(self, results: list[dict]):
+        if not self.enabled or not results:
+            return
+        now = int(time.time())
+        rows = [tuple(r.get(c) for c in _COLUMNS) + (now,) for r in results]
+        with self._lock:
+            db = self._db()
+            with db:
+                db.executemany(
+                    """INSERT INTO results (title, link, torrent_id, size, seeders, leechers, subcat, pub_date, seen_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(link) DO UPDATE SET
+                           title=excluded.title, size=excluded.size, seeders=excluded.seeders,
+                           leechers=excluded.leechers, subcat=excluded.subcat,
+                           pub_date=COALESCE(excluded.pub_date, results.pub_date), seen_at=excluded.seen_at""",
+                    rows,
+                )
+
+    def store(self, query: str, cat: str, results: list[dict]):
+        """Persist a live search and record that the query now has local coverage."""
+        if not self.enabled:
+            return
+        self.add(results)
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO coverage (query, cat, searched_at) VALUES (?, ?, ?)",
+                    (_terms(query), ygg_cats_key(cat), int(time.time())),
+                )
+
+    def coverage_age(self, query: str, cat: str) -> int | None:
+        """Seconds since the query was last searched live, or None if never."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._db().execute(
+                "SELECT searched_at FROM coverage WHERE query = ? AND cat = ?",
+                (_terms(query), ygg_cats_key(cat)),
+            ).fetchone()
+        return int(time.time()) - row[0] if row else None
+
+    def lookup(self, query: str, subcats: set[str] | None = None) -> list[dict]:
+        """Indexed results matching the query, best-seeded first and capped like a live search."""
+        tokens = words(query)
+        if not tokens:
+            return []
+        # Season/episode markers are prefixes: "s01" must also find "S01E03" (one token in a release name)
+        match = " ".join('"%s"*' % t if _MARKER_RE.fullmatch(t) else '"%s"' % t for t in tokens)
+        sql = (f"SELECT {', '.join('r.' + c for c in _COLUMNS)} FROM results_terms "
+               "JOIN results r ON r.rowid = results_terms.rowid WHERE results_terms MATCH ?")
+        params = [match]
+        if subcats:
+            sql += f" AND r.subcat IN ({', '.join('?' * len(subcats))})"
+            params.extend(sorted(subcats))
+        sql += " ORDER BY r.seeders DESC"
+        results = []
+        with self._lock:
+            for row in self._db().execute(sql, params):
+                r = dict(zip(_COLUMNS, row))
+                if matches_query(r["title"], query):
+                    results.append(r)
+                    if len(results) >= MAX_SEARCH_PAGES * 50:
+                        break
+        return results
+
+
+result_index = ResultIndex(INDEX_PATH, RESULT_INDEX_TTL)
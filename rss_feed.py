@@ -0,0 +1,81 @@
+import logging
+import threading
+import time
+
+from backend import get_backend
+from config import RSS_POLL_INTERVAL, RSS_INDEX_SIZE
+from metrics import Gauge
+from result_index import result_index
+from torznab import YGG_TO_TORZNAB, TORZNAB_TO_YGG
+
+log = logging.getLogger(__name__)
+
+# YGG sub_category → parent category, derived from the Torznab mapping
+_SUBCAT_PARENT = {str(sub): cat for cat, sub in TORZNAB_TO_YGG.values()}
+
+
+class RSSFeed:
+    def __init__(self, interval: int, size: int):
+        self.interval = interval
+        self.size = size
+        self._items: list[dict] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def start(self):
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="rss-poller", daemon=True)
+        self._thread.start()
+        log.info("RSS poller started (every %ds, %d items max)", self.interval, self.size)
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                log.warning("RSS poll failed: %s", e)
+            self._stop.wait(self.interval)
+
+    def poll(self):
+        for subcat in YGG_TO_TORZNAB:
+            if self._stop.is_set():
+                return
+            category = _SUBCAT_PARENT.get(subcat)
+            if not category:
+                continue
+            results = get_backend().latest(category, int(subcat))
+            self._add(results, subcat)
+            result_index.add(results)
+            log.info("RSS poll: %d results for sub_category %s (%d indexed)", len(results), subcat, len(self))
+
+    def _add(self, results: list[dict], subcat: str):
+        now = int(time.time())
+        with self._lock:
+            by_link = {r["link"]: r for r in self._items}
+            for r in results:
+                item = dict(r)
+                item["subcat"] = item.get("subcat") or subcat
+                item["pub_date"] = item.get("pub_date") or by_link.get(r["link"], {}).get("pub_date") or now
+                by_link[r["link"]] = item
+            items = sorted(by_link.values(), key=lambda r: r["pub_date"], reverse=True)
+            self._items = items[:self.size]
+
+    def items(self, subcats: set[str] | None = None, offset: int = 0, limit: int = 100) -> list[dict]:
+        items = self._items
+        if subcats:
+            items = [r for r in items if r.get("subcat") in subcats]
+        return items[offset:offset + limit]
+
+
+rss_feed = RSSFeed(RSS_POLL_INTERVAL, RSS_INDEX_SIZE)
+
+Gauge("yggtzn_rss_index_items", "Releases held in the RSS index.", lambda: len(rss_feed))
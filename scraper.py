@@ -0,0 +1,168 @@
+import logging
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+log = logging.getLogger(__name__)
+
+_SIZE_MULTIPLIERS = {"KO": 1024, "KB": 1024, "MO": 1024**2, "MB": 1024**2,
+                     "GO": 1024**3, "GB": 1024**3, "TO": 1024**4, "TB": 1024**4}
+
+
+def parse_size(text: str) -> int:
+    text = text.upper().replace(",", ".").strip()
+    for suffix, mult in _SIZE_MULTIPLIERS.items():
+        if suffix in text:
+            try:
+                return int(float(text.replace(suffix, "").strip()) * mult)
+            except ValueError:
+                return 0
+    try:
+        return int(text)
+    except ValueError:
+        return 0
+
+
+class _Cell:
+    __slots__ = ("text", "hidden", "name", "href")
+
+    def __init__(self):
+        self.text = []     # visible text
+        self.hidden = []   # textContent of each div.hidden
+        self.name = []     # text of a#torrent_name
+        self.href = None
+
+    def visible_text(self) -> str:
+        return "".join(self.text).strip()
+
+
+class _ResultsParser(HTMLParser):
+    """Collect the cells of every row of table.table, outside of <thead>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: list[list[_Cell]] = []
+        self._table_depth = 0
+        self._in_thead = False
+        self._row = None
+        self._cell = None
+        self._hidden_depth = 0
+        self._in_name = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            if self._table_depth or "table" in (dict(attrs).get("class") or "").split():
+                self._table_depth += 1
+            return
+        if not self._table_depth:
+            return
+
+        if tag == "thead":
+            self._in_thead = True
+        elif tag == "tr":
+            if not self._in_thead:
+                self._row = []
+        elif tag == "td":
+            if self._row is not None:
+                self._cell = _Cell()
+        elif self._cell is None:
+            return
+        elif tag == "div":
+            if self._hidden_depth:
+                self._hidden_depth += 1
+            elif "hidden" in (dict(attrs).get("class") or "").split():
+                self._hidden_depth = 1
+                self._cell.hidden.append("")
+        elif tag == "a":
+            attrs = dict(attrs)
+            if attrs.get("id") == "torrent_name":
+                self._cell.href = attrs.get("href")
+                self._in_name = True
+
+    def handle_endtag(self, tag):
+        if not self._table_depth:
+            return
+        if tag == "table":
+            self._table_depth -= 1
+        elif tag == "thead":
+            self._in_thead = False
+        elif tag == "tr":
+            if self._row is not None:
+                self.rows.append(self._row)
+            self._row = None
+        elif tag == "td":
+            if self._cell is not None and self._row is not None:
+                self._row.append(self._cell)
+            self._cell = None
+        elif tag == "div" and self._hidden_depth:
+            self._hidden_depth -= 1
+        elif tag == "a":
+            self._in_name = False
+
+    def handle_data(self, data):
+        cell = self._cell
+        if cell is None:
+            return
+        if self._hidden_depth:
+            cell.hidden[-1] += data
+        else:
+            cell.text.append(data)
+        if self._in_name:
+            cell.name.append(data)
+
+
+CF_MARKERS = ("Just a moment", "cf-challenge")
+
+
+def blocked_reason(html: str) -> str | None:
+    """Why a YGG page is not usable content (Cloudflare interstitial, logged out), or None."""
+    if any(m in html[:2000] for m in CF_MARKERS):
+        return "Cloudflare challenge"
+    if "Mon compte" not in html:
+        return "not logged in"
+    return None
+
+
+def parse_results_html(html: str, base_url: str = "") -> list[dict] | None:
+    """Parse a YGG search page. Returns None if the page has no result table rows at all."""
+    parser = _ResultsParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.rows:
+        return None
+
+    results = []
+    for cols in parser.rows:
+        try:
+            if len(cols) < 9:
+                continue
+
+            subcat = cols[0].hidden[0].strip()
+
+            if cols[1].href is None:
+                continue
+            title = " ".join("".join(cols[1].name).split())
+            link = urljoin(base_url, cols[1].href)
+
+            match = re.search(r"/(\d+)-", link)
+            torrent_id = match.group(1) if match else ""
+
+            try:
+                pub_date = int(cols[4].hidden[0].strip())
+            except (IndexError, ValueError):
+                pub_date = None
+
+            results.append({
+                "title": title,
+                "link": link,
+                "torrent_id": torrent_id,
+                "size": parse_size(cols[5].visible_text()),
+                "seeders": int(cols[7].visible_text()),
+                "leechers": int(cols[8].visible_text()),
+                "subcat": subcat,
+                "pub_date": pub_date,
+            })
+        except (IndexError, ValueError) as e:
+            log.debug("Skipping row: %s", e)
+            continue
+    return results
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+
+from backend import get_backend, get_jobs
+from config import MAX_SEARCH_PAGES, SEASON_CACHE_TTL, RESULT_INDEX_TTL, RESULT_INDEX_REFRESH
+from matching import matches_episode, parse_episodes
+from metrics import events
+from result_index import result_index
+from torznab import torznab_cats_to_ygg, ygg_cats_key
+
+log = logging.getLogger(__name__)
+
+
+_refreshing: set[tuple[str, str]] = set()
+_refreshing_lock = threading.Lock()
+
+
+def search(query: str, cat: str = "", force: bool = False) -> list[dict]:
+    """force skips the index and the negative cache and always searches YGG."""
+    age = None if force else result_index.coverage_age(query, cat)
+    if age is not None and age <= RESULT_INDEX_TTL:
+        subcats = {str(sub) for _, sub in torznab_cats_to_ygg(cat)}
+        results = result_index.lookup(query, subcats)
+        # Only non-empty searches are indexed: no rows means the index cannot answer this query, not that YGG has none
+        if results:
+            log.info("Index HIT for %r (%d results, searched %ds ago)", query, len(results), age)
+            events.inc("index_hit")
+            if age > RESULT_INDEX_REFRESH:
+                _refresh_in_background(query, cat)
+            return results
+        log.info("Index covers %r but has no matching rows, searching live", query)
+
+    key = (query.lower(), ygg_cats_key(cat))
+    empty_searches = get_jobs().empty_searches
+    retry_after = 0 if force else empty_searches.retry_after(key)
+    if retry_after:
+        log.info("Negative cache HIT for %r (retry in %ds)", query, retry_after)
+        events.inc("negative_search_hit")
+        return []
+
+    # Session/CF failures raise BackendError, so an empty list here is a genuine miss
+    results = _search_live(query, cat)
+    if not results:
+        empty_searches.record(key)
+        return results
+    empty_searches.clear(key)
+    try:
+        result_index.store(query, cat, results)
+    except Exception as e:
+        log.warning("Failed to index results for %r: %s", query, e)
+    return results
+
+
+def _refresh_in_background(query: str, cat: str):
+    key = (query.lower(), ygg_cats_key(cat))
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            results = _search_live(query, cat)
+            if results:
+                result_index.store(query, cat, results)
+            log.info("Index refreshed for %r", query)
+        except Exception as e:
+            log.warning("Background index refresh failed for %r: %s", query, e)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, name="index-refresh", daemon=True).start()
+
+
+def _search_live(query: str, cat: str) -> list[dict]:
+    ygg_cats = torznab_cats_to_ygg(cat)
+    log.debug("YGG categories: %s", ygg_cats)
+
+    if not ygg_cats:
+        return get_backend().search(query)
+
+    results = []
+    seen = set()
+    for ygg_cat, ygg_subcat in ygg_cats:
+        for r in get_backend().search(query, category=ygg_cat, sub_category=ygg_subcat):
+            if r["link"] not in seen:
+                seen.add(r["link"])
+                results.append(r)
+    return results
+
+
+# --- Season fan-in ---
+
+class SeasonCache:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: dict[tuple, tuple[float, list[dict]]] = {}
+        self._key_locks: dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: tuple) -> list[dict] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self.ttl:
+                # The caller holds this key's lock: put() drops it once nobody does
+                del self._entries[key]
+                return None
+            return results
+
+    def put(self, key: tuple, results: list[dict]):
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (t, _) in self._entries.items() if now - t > self.ttl]
+            for k in expired:
+                del self._entries[k]
+            self._entries[key] = (now, results)
+            for k in [k for k, lock in self._key_locks.items() if k not in self._entries and not lock.locked()]:
+                del self._key_locks[k]
+
+
+season_cache = SeasonCache(SEASON_CACHE_TTL)
+
+
+def search_season(title: str, season: int, cat: str = "", force: bool = False) -> list[dict]:
+    """Every release of a season, searched once per SEASON_CACHE_TTL (force searches again regardless)."""
+    season_q = f"{title} S{season:02d}"
+    key = (season_q.lower(), ygg_cats_key(cat))
+
+    # Concurrent requests for episodes of the same season wait for a single search
+    with season_cache.key_lock(key):
+        results = None if force else season_cache.get(key)
+        if results is None:
+            log.info("Season cache MISS for %r", season_q)
+            events.inc("season_cache_miss")
+            results = search(season_q, cat, force=force)
+            if results:
+                season_cache.put(key, results)
+        else:
+            log.info("Season cache HIT for %r (%d results)", season_q, len(results))
+            events.inc("season_cache_hit")
+    return results
+
+
+def search_episode(title: str, season: int, ep: int, cat: str = "") -> list[dict]:
+    """Search the whole season once, then answer each episode request from the cached set."""
+    results = search_season(title, season, cat)
+    matched = [r for r in results if matches_episode(r["title"], season, ep)]
+    log.debug("Season %r S%02d: %d/%d results match E%02d", title, season, len(matched), len(results), ep)
+    if len(results) >= MAX_SEARCH_PAGES * 50 and not any(parse_episodes(r["title"]) for r in matched):
+        # The season set was cut at the page cap: poorly seeded episodes may simply not have made it in
+        log.info("No E%02d release in the truncated season set, searching the episode", ep)
+        links = {r["link"] for r in matched}
+        matched += [r for r in search(f"{title} S{season:02d}E{ep:02d}", cat) if r["link"] not in links]
+    return matched
@@ -0,0 +1,25 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class SQLiteStore:
+    """A SQLite database opened on first use, in WAL mode so that worker processes can share it."""
+
+    schema = ""
+    functions: dict = {}  # name → one-argument Python function the schema (e.g. its triggers) may call
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for name, fn in self.functions.items():
+                self._conn.create_function(name, 1, fn, deterministic=True)
+            self._conn.executescript(self.schema)
+        return self._conn
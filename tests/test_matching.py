@@ -0,0 +1,73 @@
+import pytest
+
+from matching import matches_episode, matches_query, parse_episodes, parse_seasons, words
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Show.S01E05.FRENCH.1080p.WEB.x264", [(1, 5, 5)]),
+    ("Show S01 E05 MULTi", [(1, 5, 5)]),
+    ("Show_S01E05_VOSTFR", [(1, 5, 5)]),
+    ("Show.S01E01-E03.FRENCH", [(1, 1, 3)]),
+    ("Show.S01E01-03.FRENCH", [(1, 1, 3)]),
+    ("Show.S01E01E02E03.FRENCH", [(1, 1, 3)]),
+    ("Show.S01E01.E02.MULTi", [(1, 1, 2)]),
+    ("Show.S01E01-720p", [(1, 1, 1)]),
+    ("Show.S01E01-1080p", [(1, 1, 1)]),
+    ("Show.S02.FRENCH.1080p", []),
+    ("Show.S01E10.S02E01", [(1, 10, 10), (2, 1, 1)]),
+])
+def test_parse_episodes(title, expected):
+    assert parse_episodes(title) == expected
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Show.S02.FRENCH.1080p", {2}),
+    ("Show.S01-S03.MULTi", {1, 2, 3}),
+    ("Show S01-03 MULTi", {1, 2, 3}),
+    ("Show Intégrale S01 à S05 FRENCH", {1, 2, 3, 4, 5}),
+    ("Show.Integrale.S01.a.S04.FRENCH", {1, 2, 3, 4}),
+    ("Show Complete S01 to S03", {1, 2, 3}),
+    ("Show Saison 2 FRENCH", {2}),
+    ("Show Saison 1 à 3 FRENCH", {1, 2, 3}),
+    ("Show.S01.a.1080p", {1}),
+])
+def test_parse_seasons(title, expected):
+    assert parse_seasons(title) == expected
+
+
+@pytest.mark.parametrize("title, season, ep, expected", [
+    ("Show.S01E05.FRENCH", 1, 5, True),
+    ("Show.S01E05.FRENCH", 1, 6, False),
+    ("Show.S01E01E02E03.FRENCH", 1, 2, True),
+    ("Show.S01E01E02E03.FRENCH", 1, 3, True),
+    ("Show.S01E01E02E03.FRENCH", 1, 4, False),
+    ("Show.S01.FRENCH", 1, 7, True),
+    ("Show.S01.FRENCH", 2, 1, False),
+    ("Show Intégrale S01 à S05", 3, 4, True),
+    ("Show Intégrale S01 à S05", 6, 1, False),
+])
+def test_matches_episode(title, season, ep, expected):
+    assert matches_episode(title, season, ep) is expected
+
+
+@pytest.mark.parametrize("title, query, expected", [
+    ("The.Office.S02E03.FRENCH.1080p", "The Office S02E03", True),
+    ("The.Office.S02E04.FRENCH.1080p", "The Office S02E03", False),
+    ("The.Office.S02.FRENCH.1080p", "The Office S02E03", True),
+    ("The.Office.S02E03.FRENCH.1080p", "The Office S02", True),
+    ("The.Office.S03E01.FRENCH.1080p", "The Office S02", False),
+    ("The.Office.Intégrale.S01.à.S05", "The Office S02", True),
+    ("The Office S01E01E02E03 FRENCH", "The Office S01E02", True),
+    ("The.Office.US.S02E03", "Office S02E03", True),
+    ("Parks.and.Recreation.S02E03", "The Office S02E03", False),
+    ("Amélie.2001.FRENCH.1080p", "Amelie", True),
+    ("Marvels.Agents.of.S.H.I.E.L.D.S01E01.FRENCH", "Marvel's Agents of S.H.I.E.L.D. S01E01", True),
+    ("Greys.Anatomy.S02E03.FRENCH", "Grey’s Anatomy S02E03", True),
+])
+def test_matches_query(title, query, expected):
+    assert matches_query(title, query) is expected
+
+
+def test_words():
+    assert words("Marvel's Agents of S.H.I.E.L.D. (2013)") == ["marvels", "agents", "of", "shield", "2013"]
+    assert words("Amélie") == ["amelie"]
@@ -6,12 +6,12 @@ from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
 import requests
 
+from config import CACHE_API_URL
 from crypto import encrypt, decrypt
+from metrics import timed
 
 log = logging.getLogger(__name__)
 
-CACHE_API_URL = "http://89.168.52.228"
-
 
 # --- Bencode codec ---
 
@@ -108,6 +108,7 @@ def _inject_passkey_into_url(url_bytes: bytes, passkey: str) -> bytes:
     return url_str.replace(_PLACEHOLDER, passkey).encode("utf-8")
 
 
+@timed("strip_passkey")
 def strip_passkey(torrent_data: bytes) -> bytes:
     meta = _bdecode(torrent_data)
 
@@ -126,6 +127,7 @@ def strip_passkey(torrent_data: bytes) -> bytes:
     return _bencode(meta)
 
 
+@timed("inject_passkey")
 def inject_passkey(torrent_data: bytes, passkey: str) -> bytes:
     meta = _bdecode(torrent_data)
 
@@ -165,6 +167,7 @@ def filename_from_url(url: str) -> str:
 
 # --- HTTP cache calls ---
 
+@timed("cache_health")
 def is_cache_available() -> bool:
     try:
         resp = requests.get(f"{CACHE_API_URL}/health", timeout=5)
@@ -173,6 +176,7 @@ def is_cache_available() -> bool:
         return False
 
 
+@timed("cache_get")
 def get_from_cache(key: str) -> tuple[bytes, str] | None:
     try:
         resp = requests.get(f"{CACHE_API_URL}/cache/{key}", timeout=10)
@@ -188,6 +192,7 @@ def get_from_cache(key: str) -> tuple[bytes, str] | None:
         return None
 
 
+@timed("cache_put")
 def put_to_cache(key: str, data: bytes, filename: str = None):
     try:
         headers = {}
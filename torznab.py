@@ -1,6 +1,8 @@
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 
+from metrics import timed
+
 TORZNAB_NS = "http://torznab.com/schemas/2015/feed"
 ET.register_namespace("torznab", TORZNAB_NS)
 
@@ -53,10 +55,16 @@ def torznab_cats_to_ygg(cat_str: str) -> list[tuple[int, int]]:
     return result
 
 
+def ygg_cats_key(cat_str: str) -> str:
+    """Cache key for a Torznab cat list: lists mapping to the same YGG searches ("5000", "5000,5040") share it."""
+    return ",".join(f"{cat}:{sub}" for cat, sub in sorted(torznab_cats_to_ygg(cat_str)))
+
+
 def ygg_subcat_to_torznab(subcat: str) -> int:
     return YGG_TO_TORZNAB.get(subcat, 2000)
 
 
+@timed("xml_caps")
 def caps_xml() -> str:
     caps = ET.Element("caps")
     ET.SubElement(caps, "server", version="1.0", title="YGGTorznab")
@@ -94,6 +102,7 @@ def caps_xml() -> str:
     return '<?xml version="1.0" encoding="UTF-8"?>' + ET.tostring(caps, encoding="unicode")
 
 
+@timed("xml_search")
 def search_xml(results: list[dict], download_base: str = "", apikey: str = "") -> str:
     rss = ET.Element("rss", version="2.0")
 
@@ -104,9 +113,9 @@ def search_xml(results: list[dict], download_base: str = "", apikey: str = "") -
         item = ET.SubElement(channel, "item")
         ET.SubElement(item, "title").text = r.get("title", "")
         ET.SubElement(item, "link").text = r.get("link", "")
-        ET.SubElement(item, "pubDate").text = datetime.now(timezone.utc).strftime(
-            "%a, %d %b %Y %H:%M:%S +0000"
-        )
+        pub_date = r.get("pub_date")
+        published = datetime.fromtimestamp(pub_date, timezone.utc) if pub_date else datetime.now(timezone.utc)
+        ET.SubElement(item, "pubDate").text = published.strftime("%a, %d %b %Y %H:%M:%S +0000")
 
         link = r.get("link", "")
         if download_base and link:
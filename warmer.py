@@ -0,0 +1,188 @@
+"""Watchlist warming: re-runs the searches Sonarr/Radarr are known to need, off-peak and shortly after air times.
+
+data/watchlist.json:
+
+    [
+        {"q": "Dune"},
+        {"imdbid": "tt1375666"},
+        {"tvdbid": "81189", "season": 5, "airs": "sun 21:00"},
+        {"tmdbid": "1396", "media": "tv", "season": 2, "ep": 3, "cat": "5000", "airs": ["mon 03:00", "thu 03:00"]}
+    ]
+"""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from backend import wait_until_idle
+from config import WATCHLIST_PATH, WARM_HOURS, WARM_AIR_OFFSETS, SEASON_SEARCH, TMDB_CACHE_TTL
+from metrics import Gauge, events
+from resolver import resolve_query
+from result_index import result_index
+from search import search, search_season
+
+log = logging.getLogger(__name__)
+
+TICK_SECONDS = 60
+PAUSE_SECONDS = 5
+_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _parse_hours(text: str) -> tuple[int, int] | None:
+    """"3-6" → (3, 6): from 03:00 up to 06:00, wrapping past midnight if the end is earlier."""
+    start, sep, end = text.partition("-")
+    if not sep:
+        return None
+    try:
+        return int(start) % 24, int(end) % 24
+    except ValueError:
+        log.warning("Ignoring invalid WARM_HOURS=%r (expected e.g. 3-6)", text)
+        return None
+
+
+def _air_offsets(text: str) -> list[int]:
+    try:
+        return [int(m) for m in text.split(",") if m.strip()]
+    except ValueError:
+        log.warning("Ignoring invalid WARM_AIR_OFFSETS=%r (expected minutes, e.g. 30,90,180)", text)
+        return []
+
+
+def _in_window(hour: int, window: tuple[int, int]) -> bool:
+    start, end = window
+    return start <= hour < end if start <= end else hour >= start or hour < end
+
+
+def _air_times(airs: str | list[str], now: datetime) -> list[datetime]:
+    """Occurrences of each "fri 21:00" / "21:00" (daily) slot, from a week ago to tomorrow."""
+    times = []
+    for slot in [airs] if isinstance(airs, str) else airs:
+        day, _, clock = slot.strip().lower().rpartition(" ")
+        try:
+            hour, minute = (int(x) for x in clock.split(":"))
+        except ValueError:
+            log.warning("Ignoring invalid air time %r (expected e.g. 'fri 21:00')", slot)
+            continue
+        for days_ago in range(-1, 8):
+            at = (now - timedelta(days=days_ago)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if not day or _WEEKDAYS[at.weekday()] == day[:3]:
+                times.append(at)
+    return times
+
+
+class Warmer:
+    def __init__(self, path: Path, hours: str, air_offsets: list[int]):
+        self.path = path
+        self.window = _parse_hours(hours)
+        self.air_offsets = air_offsets
+        self.entries: list[dict] = []
+        self._mtime = None
+        self._last_window_day = None
+        self._last_tick = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not self.path.exists() or (self._thread and self._thread.is_alive()):
+            return
+        if not (SEASON_SEARCH or result_index.enabled or TMDB_CACHE_TTL):
+            log.warning("Watchlist found but SEASON_SEARCH, RESULT_INDEX_TTL and TMDB_CACHE_TTL are all off: "
+                        "nothing to warm")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="watchlist-warmer", daemon=True)
+        self._thread.start()
+        log.info("Watchlist warmer started (%s, off-peak %s, %s min after air times)",
+                 self.path, WARM_HOURS or "disabled", ",".join(map(str, self.air_offsets)))
+
+    def stop(self):
+        self._stop.set()
+
+    def _load(self):
+        try:
+            mtime = self.path.stat().st_mtime
+            if mtime == self._mtime:
+                return
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            log.warning("Failed to read watchlist %s: %s", self.path, e)
+            return
+        self.entries = [e for e in entries if isinstance(e, dict)]
+        self._mtime = mtime
+        log.info("Watchlist loaded: %d entries", len(self.entries))
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self._load()
+                self.tick(datetime.now())
+            except Exception as e:
+                log.warning("Watchlist warming failed: %s", e)
+            self._stop.wait(TICK_SECONDS)
+
+    def due(self, now: datetime) -> list[dict]:
+        """Entries to warm at now: all of them once per off-peak window, plus those whose air time + an offset
+        passed since the previous tick."""
+        last = self._last_tick or now
+        self._last_tick = now
+
+        if self.window and _in_window(now.hour, self.window) and self._last_window_day != now.date():
+            self._last_window_day = now.date()
+            return list(self.entries)
+
+        due = []
+        for entry in self.entries:
+            if not entry.get("airs"):
+                continue
+            slots = [at + timedelta(minutes=m) for at in _air_times(entry["airs"], now) for m in self.air_offsets]
+            if any(last < slot <= now for slot in slots):
+                due.append(entry)
+        return due
+
+    def tick(self, now: datetime):
+        for entry in self.due(now):
+            if self._stop.is_set():
+                return
+            try:
+                searched = self.warm(entry)
+            except Exception as e:
+                log.warning("Warming %s failed: %s", entry, e)
+                searched = True
+            if searched:
+                self._stop.wait(PAUSE_SECONDS)
+
+    def warm(self, entry: dict) -> bool:
+        """Resolve the entry (keeping the TMDb cache hot), then search YGG only if a cache the API reads would keep
+        the results; returns whether it searched. The season cache counts: with a broker, the warmer and the API's
+        search_episode both run in the broker."""
+        season = entry.get("season")
+        ep = entry.get("ep")
+        media = entry.get("media") or ("tv" if season is not None or entry.get("tvdbid") else "movie")
+        title = resolve_query(q=entry.get("q", ""), imdbid=str(entry.get("imdbid", "")),
+                              tmdbid=str(entry.get("tmdbid", "")), tvdbid=str(entry.get("tvdbid", "")), media=media)
+        if not title:
+            log.warning("Watchlist entry %s did not resolve to a title", entry)
+            return False
+        # Without a cat, search the categories Sonarr/Radarr ask for, so the API finds what was warmed
+        cat = str(entry.get("cat") or ("5000" if media == "tv" else "2000"))
+
+        if season is not None and SEASON_SEARCH:
+            wait_until_idle(self._stop)
+            results = search_season(title, int(season), cat, force=True)
+        elif result_index.enabled:
+            if season is not None:
+                title += f" S{int(season):02d}" + (f"E{int(ep):02d}" if ep is not None else "")
+            wait_until_idle(self._stop)
+            results = search(title, cat, force=True)
+        else:
+            log.debug("Resolved %r; no result cache enabled, not searching YGG", title)
+            return False
+        log.info("Warmed %r (%d results)", title, len(results))
+        events.inc("watchlist_warm")
+        return True
+
+
+warmer = Warmer(Path(__file__).parent / WATCHLIST_PATH, WARM_HOURS, _air_offsets(WARM_AIR_OFFSETS))
+
+Gauge("yggtzn_watchlist_entries", "Entries in the warming watchlist.", lambda: len(warmer.entries))